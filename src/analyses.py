@@ -0,0 +1,239 @@
+"""The sections of script.py as named, independently runnable analyses.
+
+script.py runs every exercise in one go and imports sklearn, scipy, pandas
+and matplotlib at module level. Here each section is a function that imports
+what it needs when it runs, takes its results from sections.py (shared with
+dag.py) or the datasets registry, and only touches matplotlib when plots are
+requested. Tables are built with
+evaluation.contingency rather than pandas. cli.py selects and runs them.
+"""
+
+import os
+
+import numpy as np
+
+import datasets
+import sections
+
+
+def _pyplot():
+    from matplotlib import pyplot as plt
+
+    return plt
+
+
+def _print_crosstab(rows, columns):
+    from evaluation import contingency
+
+    table, row_classes, column_classes = contingency(rows, columns)
+    header = [""] + [str(label) for label in column_classes]
+    lines = [header] + [
+        [str(label)] + [str(count) for count in counts]
+        for label, counts in zip(row_classes, table)
+    ]
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    for line in lines:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)))
+
+
+def _print_largest(values, names, n=5):
+    for i in np.argsort(-values, kind="stable")[:n]:
+        print("%-30s %.6f" % (names[i], values[i]))
+
+
+def kmeans_points(plots=False):
+    """KMeans with 3 clusters on points, labelling new_points."""
+    from sklearn.cluster import KMeans
+
+    new_points = datasets.load("new_points")
+    model = KMeans(n_clusters=3).fit(datasets.load("points"))
+    labels = model.predict(new_points)
+    print(labels)
+
+    if plots:
+        plt = _pyplot()
+        plt.scatter(new_points[:, 0], new_points[:, 1], c=labels, alpha=0.5)
+        centroids = model.cluster_centers_
+        plt.scatter(centroids[:, 0], centroids[:, 1], marker="D", s=50)
+        plt.show()
+
+
+def seeds_elbow(plots=False):
+    """Inertia of KMeans on the seeds for k = 1..5, then varieties by cluster."""
+    from sklearn.cluster import KMeans
+
+    samples = datasets.load("seeds_samples")
+    ks = range(1, 6)
+    inertias = [KMeans(n_clusters=k).fit(samples).inertia_ for k in ks]
+    print(dict(zip(ks, inertias)))
+
+    if plots:
+        plt = _pyplot()
+        plt.plot(ks, inertias, "-o")
+        plt.xlabel("number of clusters, k")
+        plt.ylabel("inertia")
+        plt.xticks(ks)
+        plt.show()
+
+    labels = KMeans(n_clusters=3).fit_predict(samples)
+    _print_crosstab(labels, datasets.load("seeds_varieties"))
+
+
+def fish_pipeline(plots=False):
+    """Standardized KMeans with 4 clusters on the fish, against species."""
+    from sklearn.cluster import KMeans
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    samples = datasets.load("fish_samples")
+    pipeline = make_pipeline(StandardScaler(), KMeans(n_clusters=4))
+    labels = pipeline.fit(samples).predict(samples)
+    _print_crosstab(labels, datasets.load("fish_species"))
+
+
+def stock_clusters(plots=False):
+    """Normalized KMeans with 10 clusters on the daily stock movements."""
+    labels = sections.stock_labels()
+    companies = datasets.load("companies")
+    for i in np.argsort(labels, kind="stable"):
+        print("%2d  %s" % (labels[i], companies[i]))
+
+
+def linkage_dendrograms(plots=False):
+    """Hierarchical clustering of seeds, stocks and Eurovision scores."""
+    samples, varieties = sections.seeds_subset()
+    seeds_mergings = sections.seeds_mergings(samples)
+    stock_mergings = sections.stock_mergings(sections.normalized_movements())
+    scores, countries = sections.eurovision_subset()
+    eurovision_mergings = sections.eurovision_mergings(scores)
+
+    if plots:
+        from scipy.cluster.hierarchy import dendrogram
+
+        plt = _pyplot()
+        for mergings, labels in (
+            (seeds_mergings, varieties),
+            (stock_mergings, datasets.load("companies")),
+            (eurovision_mergings, countries),
+        ):
+            dendrogram(
+                mergings, labels=labels.tolist(), leaf_rotation=90, leaf_font_size=6
+            )
+            plt.show()
+
+    _print_crosstab(sections.seeds_cut(seeds_mergings), varieties)
+
+
+def tsne_maps(plots=False):
+    """t-SNE maps of the seeds and of the normalized stock movements."""
+    seeds = sections.seeds_tsne()
+    stocks = sections.stock_tsne(sections.normalized_movements())
+    print(seeds.shape, stocks.shape)
+
+    if plots:
+        plt = _pyplot()
+        plt.scatter(seeds[:, 0], seeds[:, 1], c=datasets.load("seeds_variety_numbers"))
+        plt.show()
+        plt.scatter(stocks[:, 0], stocks[:, 1], alpha=0.5)
+        for x, y, company in zip(
+            stocks[:, 0], stocks[:, 1], datasets.load("companies")
+        ):
+            plt.annotate(company, (x, y), fontsize=5, alpha=0.75)
+        plt.show()
+
+
+def pca_grains(plots=False):
+    """PCA decorrelation of the grains and the intrinsic dimension of the fish."""
+    from scipy.stats import pearsonr
+    from sklearn.decomposition import PCA
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    grains = datasets.load("grains")
+    print(pearsonr(grains[:, 0], grains[:, 1])[0])
+    model = sections.grains_pca()
+    pca_features = model.transform(grains)
+    print(pearsonr(pca_features[:, 0], pca_features[:, 1])[0])
+
+    samples = datasets.load("fish_samples")
+    pca = PCA()
+    make_pipeline(StandardScaler(), pca).fit(samples)
+    scaled_samples = StandardScaler().fit_transform(samples)
+    print(PCA(n_components=2).fit(scaled_samples).transform(scaled_samples).shape)
+
+    if plots:
+        plt = _pyplot()
+        plt.scatter(pca_features[:, 0], pca_features[:, 1])
+        plt.axis("equal")
+        plt.show()
+        plt.scatter(grains[:, 0], grains[:, 1])
+        mean, first_pc = model.mean_, model.components_[0, :]
+        plt.arrow(mean[0], mean[1], first_pc[0], first_pc[1], color="red", width=0.01)
+        plt.axis("equal")
+        plt.show()
+        features = range(pca.n_components_)
+        plt.bar(features, pca.explained_variance_)
+        plt.xlabel("PCA feature")
+        plt.ylabel("variance")
+        plt.xticks(features)
+        plt.show()
+
+
+def articles_nmf(plots=False):
+    """SVD clustering, NMF topics and recommendations for the Wikipedia articles."""
+    from topics import Vocabulary, top_terms
+
+    articles, titles = sections.wikipedia()
+    labels = sections.article_labels(articles)
+    for i in np.argsort(labels, kind="stable"):
+        print("%d  %s" % (labels[i], titles[i]))
+
+    nmf_features, components = sections.article_nmf(articles)
+    for title in ("Anne Hathaway", "Denzel Washington"):
+        print(title, nmf_features[titles.index(title)].round(2))
+
+    vocabulary = Vocabulary(
+        os.path.join(datasets.DATA_DIR, "wikipedia-vocabulary-utf8.txt")
+    )
+    topics = top_terms(components, n=5, vocabulary=vocabulary)
+    for component, (words, weights) in enumerate(zip(topics.words, topics.weights)):
+        print(component, ", ".join("%s %.3f" % pair for pair in zip(words, weights)))
+
+    _print_largest(sections.article_similarities(nmf_features, titles), titles)
+
+
+def digits_nmf(plots=False):
+    """NMF and PCA components of the LCD digits."""
+    samples = datasets.load("lcd_digits")
+    features, nmf_components = sections.digit_nmf()
+    print(features[0, :])
+    pca_components = sections.digit_pca_components()
+
+    if plots:
+        plt = _pyplot()
+        for component in [samples[0]] + list(nmf_components) + list(pca_components):
+            plt.figure()
+            plt.imshow(component.reshape((13, 8)), cmap="gray", interpolation="nearest")
+            plt.colorbar()
+            plt.show()
+
+
+def artist_recs(plots=False):
+    """Artist recommendations from NMF features of the listening counts."""
+    similarities = sections.artist_similarities(sections.artist_features())
+    _print_largest(similarities, datasets.load("artist_names").tolist())
+
+
+# Analysis name -> function(plots), in script.py order
+ANALYSES = {
+    "kmeans-points": kmeans_points,
+    "seeds-elbow": seeds_elbow,
+    "fish-pipeline": fish_pipeline,
+    "stock-clusters": stock_clusters,
+    "linkage": linkage_dendrograms,
+    "tsne": tsne_maps,
+    "pca": pca_grains,
+    "articles-nmf": articles_nmf,
+    "digits-nmf": digits_nmf,
+    "artist-recs": artist_recs,
+}
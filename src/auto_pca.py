@@ -0,0 +1,132 @@
+"""PCA that picks its solver from the shape and size of the input.
+
+The PCA sections of script.py all run a full dense SVD. AutoPCA chooses:
+
+* "full" (exact LAPACK SVD) for small inputs or when most components are kept;
+* "randomized" SVD when only a few components of a larger matrix are needed;
+* "incremental" batched PCA when the samples exceed memory_limit, are a
+  memory-mapped array, or arrive as chunks through fit_chunks.
+
+The fitted attributes mirror sklearn's PCA, so plotting code such as
+plt.bar(range(pca.n_components_), pca.explained_variance_) works unchanged.
+"""
+
+import numbers
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.decomposition import PCA, IncrementalPCA
+
+SOLVERS = ("auto", "full", "randomized", "incremental")
+
+ATTRIBUTES = (
+    "components_",
+    "explained_variance_",
+    "explained_variance_ratio_",
+    "singular_values_",
+    "mean_",
+    "n_components_",
+    "noise_variance_",
+    "n_samples_seen_",
+)
+
+
+def choose_solver(n_samples, n_features, n_components, nbytes, memory_limit):
+    """Return the solver AutoPCA would use for an input of this shape."""
+    if nbytes > memory_limit:
+        return "incremental"
+    rank = min(n_samples, n_features)
+    # The randomized solver needs a component count, not a variance
+    # fraction or "mle"
+    if (
+        isinstance(n_components, numbers.Integral)
+        and max(n_samples, n_features) > 500
+        and n_components < 0.8 * rank
+    ):
+        return "randomized"
+    return "full"
+
+
+class AutoPCA(BaseEstimator, TransformerMixin):
+    """Principal component analysis with automatic solver selection."""
+
+    def __init__(
+        self,
+        n_components=None,
+        solver="auto",
+        batch_size=None,
+        memory_limit=512 * 2**20,
+        random_state=None,
+    ):
+        self.n_components = n_components
+        self.solver = solver
+        self.batch_size = batch_size
+        self.memory_limit = memory_limit
+        self.random_state = random_state
+
+    def _incremental(self):
+        return IncrementalPCA(
+            n_components=self.n_components, batch_size=self.batch_size
+        )
+
+    def _publish(self, estimator):
+        self.estimator_ = estimator
+        for name in ATTRIBUTES:
+            if hasattr(estimator, name):
+                setattr(self, name, getattr(estimator, name))
+        self.n_features_in_ = estimator.components_.shape[1]
+        return self
+
+    def fit(self, X, y=None):
+        if self.solver not in SOLVERS:
+            raise ValueError(
+                "solver must be one of %s, got %r" % (SOLVERS, self.solver)
+            )
+        self.solver_ = self.solver
+        if self.solver == "auto":
+            if isinstance(X, np.memmap):
+                self.solver_ = "incremental"
+            else:
+                X = np.asarray(X)
+                self.solver_ = choose_solver(
+                    X.shape[0],
+                    X.shape[1],
+                    self.n_components,
+                    X.nbytes,
+                    self.memory_limit,
+                )
+
+        if self.solver_ == "incremental":
+            estimator = self._incremental()
+            batch_size = self.batch_size or max(
+                5 * X.shape[1], (self.n_components or 0) + 1
+            )
+            bounds = list(range(0, X.shape[0], batch_size)) + [X.shape[0]]
+            if len(bounds) > 2 and bounds[-1] - bounds[-2] < (self.n_components or 1):
+                # Fold a short final batch into the previous one
+                del bounds[-2]
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                # Slicing a memory-mapped array only pages in this batch
+                estimator.partial_fit(np.asarray(X[start:stop]))
+        else:
+            estimator = PCA(
+                n_components=self.n_components,
+                svd_solver=self.solver_,
+                random_state=self.random_state,
+            )
+            estimator.fit(X)
+        return self._publish(estimator)
+
+    def fit_chunks(self, chunks):
+        """Fit incrementally over the row blocks produced by chunks()."""
+        self.solver_ = "incremental"
+        estimator = self._incremental()
+        for chunk in chunks():
+            estimator.partial_fit(chunk)
+        return self._publish(estimator)
+
+    def transform(self, X):
+        return self.estimator_.transform(X)
+
+    def inverse_transform(self, X):
+        return self.estimator_.inverse_transform(X)
@@ -0,0 +1,63 @@
+"""Scaling of DistributedKMeans from 1 to N local worker processes.
+
+Each run fits the same blobs with 1, 2, ... --max-workers workers and reports
+the wall time, the speedup over one worker and the iterations run, which
+differ between runs because the k-means|| draws depend on the sharding. It
+also reports how far the result is from single-node KMeans (Lloyd, started
+from the same initial centres).
+
+Run from the src directory: python bench_distributed.py [--rows N] [--max-workers N]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+
+from distributed_kmeans import DistributedKMeans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--features", type=int, default=50)
+    parser.add_argument("--clusters", type=int, default=20)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    X, _ = make_blobs(
+        args.rows, args.features, centers=args.clusters, cluster_std=5, random_state=0
+    )
+    first = None
+    for n_workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        model = DistributedKMeans(
+            args.clusters, n_workers=n_workers, random_state=0
+        ).fit(X)
+        elapsed = time.perf_counter() - start
+        first = first or elapsed
+
+        # Single node, same starting point
+        reference = KMeans(
+            args.clusters, init=model.init_centers_, n_init=1, algorithm="lloyd"
+        ).fit(X)
+        print(
+            "%2d workers %8.2fs  speedup %5.2fx  iterations %3d (%.3fs each)  inertia %+.2e  "
+            "max centre difference %.2e"
+            % (
+                n_workers,
+                elapsed,
+                first / elapsed,
+                model.n_iter_,
+                elapsed / max(model.n_iter_, 1),
+                (model.inertia_ - reference.inertia_) / reference.inertia_,
+                np.abs(model.cluster_centers_ - reference.cluster_centers_).max(),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
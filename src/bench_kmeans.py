@@ -0,0 +1,62 @@
+"""Speed of FastKMeans against the default KMeans configuration.
+
+Run from the src directory: python bench_kmeans.py [--rows N] [--n-jobs J]
+The synthetic set defaults to 1M x 50; pass --rows 10000000 for the full
+10M x 50 comparison.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.preprocessing import normalize
+
+import datasets
+from fast_kmeans import FastKMeans
+
+
+def compare(name, X, n_clusters, n_jobs, n_init):
+    start = time.perf_counter()
+    baseline = KMeans(n_clusters=n_clusters, n_init=n_init, algorithm="lloyd").fit(X)
+    baseline_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = FastKMeans(n_clusters=n_clusters, n_init=n_init, n_jobs=n_jobs).fit(X)
+    fast_time = time.perf_counter() - start
+
+    print(
+        "%-10s %-12s baseline %8.3fs  fast %8.3fs  speedup %5.2fx  inertia %+.3f%%"
+        % (
+            name,
+            "%dx%d" % X.shape,
+            baseline_time,
+            fast_time,
+            baseline_time / fast_time,
+            100 * (fast.inertia_ - baseline.inertia_) / baseline.inertia_,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--n-init", type=int, default=10)
+    args = parser.parse_args()
+
+    seeds = np.asarray(datasets.load("seeds_samples"))
+    compare("seeds", seeds, 3, args.n_jobs, args.n_init)
+
+    movements = normalize(datasets.load("movements"))
+    compare("stocks", movements, 10, args.n_jobs, args.n_init)
+
+    synthetic, _ = make_blobs(
+        args.rows, n_features=50, centers=20, cluster_std=4.0, random_state=0
+    )
+    compare("synthetic", synthetic, 20, args.n_jobs, args.n_init)
+
+
+if __name__ == "__main__":
+    main()
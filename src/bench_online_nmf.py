@@ -0,0 +1,65 @@
+"""Compare OnlineNMF against sklearn's batch NMF.
+
+Run from the src directory: python bench_online_nmf.py [--rows N]
+"""
+
+import argparse
+import time
+
+from scipy import sparse
+from sklearn.decomposition import NMF
+from sklearn.preprocessing import MaxAbsScaler
+
+from online_nmf import OnlineNMF, reconstruction_error
+from scrobbler import ingest_scrobbles
+from sparse_csv import load_sparse_csv
+
+
+def compare(name, X, n_components, batch_size):
+    start = time.perf_counter()
+    batch = NMF(n_components=n_components, max_iter=500, random_state=0)
+    W = batch.fit_transform(X)
+    batch_time = time.perf_counter() - start
+    batch_error = reconstruction_error(X, W, batch.components_)
+
+    start = time.perf_counter()
+    online = OnlineNMF(n_components=n_components, batch_size=batch_size, random_state=0)
+    W = online.fit_transform(X)
+    online_time = time.perf_counter() - start
+    online_error = reconstruction_error(X, W, online.components_)
+
+    print(
+        "%-10s shape=%-14s batch %7.2fs err %10.4g  online %7.2fs err %10.4g (%+.1f%%)"
+        % (
+            name,
+            "%dx%d" % X.shape,
+            batch_time,
+            batch_error,
+            online_time,
+            online_error,
+            100 * (online_error - batch_error) / batch_error,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    articles, _, _ = load_sparse_csv("wikipedia-vectors.csv", transpose=True)
+    compare("articles", articles, 6, 16)
+
+    artists, _ = ingest_scrobbles("scrobbler-small-sample.csv")
+    compare("artists", MaxAbsScaler().fit_transform(artists), 20, 32)
+
+    # Larger synthetic corpus with the sparsity of the articles matrix
+    density = articles.nnz / (articles.shape[0] * articles.shape[1])
+    corpus = sparse.random(
+        args.rows, articles.shape[1], density=density, format="csr", random_state=0
+    )
+    compare("synthetic", corpus, 6, 4096)
+
+
+if __name__ == "__main__":
+    main()
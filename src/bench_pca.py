@@ -0,0 +1,59 @@
+"""Time each PCA solver on tall-skinny and wide matrices.
+
+Run from the src directory: python bench_pca.py [--scale S]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from auto_pca import AutoPCA
+
+
+def low_rank(n_samples, n_features, rank, seed=0):
+    # Low-rank signal plus noise, so the leading components are well defined
+    rng = np.random.RandomState(seed)
+    signal = rng.standard_normal((n_samples, rank)) @ rng.standard_normal(
+        (rank, n_features)
+    )
+    return signal + 0.1 * rng.standard_normal((n_samples, n_features))
+
+
+def run(name, X, n_components):
+    start = time.perf_counter()
+    reference = PCA(n_components=n_components, svd_solver="full").fit(X)
+    print("%-12s %-12s %8.3fs" % (name, "full", time.perf_counter() - start))
+
+    for solver in ("randomized", "incremental", "auto"):
+        start = time.perf_counter()
+        model = AutoPCA(n_components=n_components, solver=solver, random_state=0).fit(X)
+        elapsed = time.perf_counter() - start
+        gap = (
+            np.abs(model.explained_variance_ - reference.explained_variance_).max()
+            / reference.explained_variance_[0]
+        )
+        print(
+            "%-12s %-12s %8.3fs  max variance gap %.2e%s"
+            % (
+                name,
+                solver,
+                elapsed,
+                gap,
+                "  (chose %s)" % model.solver_ if solver == "auto" else "",
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    run("tall-skinny", low_rank(int(200000 * args.scale), 50, 10), 10)
+    run("wide", low_rank(2000, int(10000 * args.scale), 10), 10)
+
+
+if __name__ == "__main__":
+    main()
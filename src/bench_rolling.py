@@ -0,0 +1,85 @@
+"""Per-day cost of RollingClusters against refitting the window every day.
+
+The stock movements are split into a history and a stream of later days.
+Both routes fit on the history; then, day by day, RollingClusters.update is
+timed against a warm-started make_pipeline(Normalizer(), KMeans) refit of
+the same window. --scale tiles the companies with small jitter to show how
+both costs grow with the number of rows.
+
+Run from the src directory: python bench_rolling.py [--scale N] [--days N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score
+from sklearn.preprocessing import normalize
+
+import datasets
+from rolling import RollingClusters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--window", type=int, default=250)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    movements = np.asarray(datasets.load("movements"))
+    movements = np.vstack(
+        [movements]
+        + [
+            movements * (1 + 0.05 * rng.standard_normal(movements.shape))
+            for _ in range(args.scale - 1)
+        ]
+    )
+    split = movements.shape[1] - args.days
+    history, stream = movements[:, :split], movements[:, split:]
+
+    rolling = RollingClusters(n_clusters=10, window=args.window, random_state=0)
+    rolling.fit(history)
+    changed = 0
+    start = time.perf_counter()
+    for day in stream.T:
+        changed += len(rolling.update(day).companies)
+    rolling_seconds = (time.perf_counter() - start) / args.days
+
+    # The refit route warm-starts from the previous day's centroids, shifted
+    # by one day with the new day's coordinate starting at zero
+    window = normalize(history[:, -args.window :])
+    model = KMeans(10, n_init=10, random_state=0).fit(window)
+    start = time.perf_counter()
+    for end in range(split + 1, movements.shape[1] + 1):
+        window = normalize(movements[:, max(0, end - args.window) : end])
+        init = model.cluster_centers_
+        if init.shape[1] == window.shape[1]:
+            init = np.roll(init, -1, axis=1)
+            init[:, -1] = 0
+        else:
+            init = np.hstack([init, np.zeros((10, 1))])
+        model = KMeans(10, init=init, n_init=1).fit(window)
+    refit_seconds = (time.perf_counter() - start) / args.days
+
+    window = normalize(movements[:, -args.window :])
+    fresh = KMeans(10, n_init=10, random_state=0).fit_predict(window)
+    print(
+        "%d companies, window %d: update %.2f ms/day (%d changes), "
+        "refit %.2f ms/day, ARI of final labels vs fresh fit %.3f (refit %.3f)"
+        % (
+            movements.shape[0],
+            args.window,
+            1e3 * rolling_seconds,
+            changed,
+            1e3 * refit_seconds,
+            adjusted_rand_score(fresh, rolling.labels_),
+            adjusted_rand_score(fresh, model.labels_),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Throughput and peak memory of scrobbler log ingestion.
+
+Run from the src directory: python bench_scrobbler.py [--rows N]
+[--baseline results.json] [--save results.json]. With --baseline the run
+fails when throughput drops or peak RSS grows by more than --tolerance.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+
+from scrobbler import ingest_scrobbles
+
+
+def write_log(path, rows, n_artists, n_users, seed=0):
+    # Synthetic log with the same columns as scrobbler-small-sample.csv
+    rng = np.random.RandomState(seed)
+    with open(path, "w") as f:
+        f.write("user_offset,artist_offset,playcount\n")
+        for start in range(0, rows, 1000000):
+            size = min(1000000, rows - start)
+            chunk = pd.DataFrame(
+                {
+                    "user_offset": rng.randint(0, n_users, size),
+                    "artist_offset": rng.zipf(1.5, size) % n_artists,
+                    "playcount": rng.randint(1, 500, size),
+                }
+            )
+            chunk.to_csv(f, header=False, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000000)
+    parser.add_argument("--chunksize", type=int, default=1000000)
+    parser.add_argument("--baseline")
+    parser.add_argument("--save")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # The bundled sample must match the coo_matrix construction of script.py
+    sample, _ = ingest_scrobbles("scrobbler-small-sample.csv")
+    scrobbles = pd.read_csv("scrobbler-small-sample.csv")
+    expected = coo_matrix(
+        (
+            scrobbles["playcount"],
+            (scrobbles["artist_offset"], scrobbles["user_offset"]),
+        )
+    )
+    assert sample.shape == expected.shape and (sample != expected).nnz == 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scrobbles.csv")
+        write_log(path, args.rows, n_artists=100000, n_users=1000000)
+        artists, stats = ingest_scrobbles(path, chunksize=args.chunksize)
+
+    result = {
+        "rows": stats.rows,
+        "nnz": int(artists.nnz),
+        "rows_per_sec": stats.rows_per_sec,
+        "peak_rss": stats.peak_rss,
+    }
+    print(json.dumps(result, indent=2))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = []
+        if result["rows_per_sec"] < baseline["rows_per_sec"] * (1 - args.tolerance):
+            failures.append("throughput regressed")
+        if result["peak_rss"] > baseline["peak_rss"] * (1 + args.tolerance):
+            failures.append("peak RSS regressed")
+        if failures:
+            sys.exit(", ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Load-generator benchmark for the batch prediction service.
+
+Run from the src directory: python bench_serving.py [--clients C]
+[--requests R] [--rows-per-request N]
+"""
+
+import argparse
+import asyncio
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.decomposition import TruncatedSVD
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import Normalizer, StandardScaler
+
+from serving import BatchingServer, CentroidScorer
+
+
+async def client(server, points, requests, rows, rng):
+    for _ in range(requests):
+        start = rng.randint(0, len(points) - rows)
+        await server.predict(points[start : start + rows])
+
+
+async def load(scorer, points, args):
+    server = BatchingServer(scorer, max_batch=args.max_batch, max_delay=args.max_delay)
+    await server.start()
+    await asyncio.gather(
+        *(
+            client(
+                server,
+                points,
+                args.requests,
+                args.rows_per_request,
+                np.random.RandomState(i),
+            )
+            for i in range(args.clients)
+        )
+    )
+    await server.stop()
+    return server.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows-per-request", type=int, default=100)
+    parser.add_argument("--max-batch", type=int, default=8192)
+    parser.add_argument("--max-delay", type=float, default=0.002)
+    args = parser.parse_args()
+
+    points, _ = make_blobs(200000, n_features=50, centers=10, random_state=0)
+    points = np.abs(points)
+    pipelines = {
+        "scaler+kmeans": make_pipeline(StandardScaler(), KMeans(10, n_init=3)),
+        "normalizer+kmeans": make_pipeline(Normalizer(), KMeans(10, n_init=3)),
+        "svd+kmeans": make_pipeline(TruncatedSVD(20), KMeans(10, n_init=3)),
+    }
+    for name, pipeline in pipelines.items():
+        pipeline.fit(points[:20000])
+        scorer = CentroidScorer(pipeline)
+        assert (scorer.predict(points[:1000]) == pipeline.predict(points[:1000])).all()
+
+        stats = asyncio.run(load(scorer, points, args))
+        print(
+            "%-18s %6d requests  p50 %6.2f ms  p95 %6.2f ms  p99 %6.2f ms  %9.0f rows/s"
+            % (
+                name,
+                stats["requests"],
+                1e3 * stats["p50"],
+                1e3 * stats["p95"],
+                1e3 * stats["p99"],
+                stats["rows_per_sec"],
+            )
+        )
+        scorer.close()
+
+
+if __name__ == "__main__":
+    main()
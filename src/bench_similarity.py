@@ -0,0 +1,63 @@
+"""Per-query latency and throughput of the SimilarityIndex modes.
+
+Queries are answered one at a time, as an online recommender would, and
+again as one batch. The approximate mode also reports its recall of the
+exact top k.
+
+Run from the src directory: python bench_similarity.py [--items N]
+[--features D] [--queries Q]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from similarity import SimilarityIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=200000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    # Non-negative features, like the NMF outputs the recommenders use
+    rng = np.random.RandomState(0)
+    features = np.abs(rng.standard_normal((args.items, args.features)))
+    labels = rng.choice(args.items, args.queries, replace=False)
+
+    exact_rows = None
+    for mode in ("exact", "lsh"):
+        start = time.perf_counter()
+        index = SimilarityIndex(features, mode=mode, random_state=0)
+        build = time.perf_counter() - start
+
+        latencies = np.empty(len(labels))
+        for i, label in enumerate(labels):
+            start = time.perf_counter()
+            index.query_labels(label, k=args.k)
+            latencies[i] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows, _ = index.query_labels(labels, k=args.k)
+        batch = time.perf_counter() - start
+
+        recall = ""
+        if exact_rows is None:
+            exact_rows = rows
+        else:
+            hits = sum(len(np.intersect1d(a, b)) for a, b in zip(rows, exact_rows))
+            recall = "  recall@%d %.3f" % (args.k, hits / exact_rows.size)
+        p50, p95, p99 = 1e3 * np.percentile(latencies, [50, 95, 99])
+        print(
+            "%-6s build %6.2fs  p50 %6.3f ms  p95 %6.3f ms  p99 %6.3f ms  "
+            "%8.0f queries/s batched%s"
+            % (mode, build, p50, p95, p99, len(labels) / batch, recall)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compare spherical KMeans on sparse rows with the TruncatedSVD -> KMeans route.
+
+Run from the src directory: python bench_spherical.py [--rows N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from scipy import sparse
+from sklearn.cluster import KMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.metrics import adjusted_rand_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import Normalizer
+
+from sparse_csv import load_sparse_csv
+from spherical_kmeans import SphericalKMeans
+
+
+def topic_corpus(rows, n_terms, n_topics, terms_per_doc=100, seed=0):
+    # Each document draws most of its terms from its topic's slice of the
+    # vocabulary and the rest from anywhere
+    rng = np.random.RandomState(seed)
+    topics = rng.randint(n_topics, size=rows)
+    width = n_terms // n_topics
+    local = topics[:, None] * width + rng.randint(width, size=(rows, terms_per_doc))
+    noise = rng.randint(n_terms, size=(rows, terms_per_doc))
+    columns = np.where(rng.rand(rows, terms_per_doc) < 0.7, local, noise)
+    counts = sparse.csr_matrix(
+        (
+            np.ones(rows * terms_per_doc),
+            (np.repeat(np.arange(rows), terms_per_doc), columns.ravel()),
+        ),
+        shape=(rows, n_terms),
+    )
+    counts.sum_duplicates()
+    return counts, topics
+
+
+def measure(pipeline, X):
+    tracemalloc.start()
+    start = time.perf_counter()
+    labels = pipeline.fit_predict(X)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return labels, elapsed, peak
+
+
+def compare(name, X, n_clusters, truth=None):
+    svd_route = make_pipeline(
+        TruncatedSVD(n_components=50), KMeans(n_clusters, n_init=10)
+    )
+    sparse_route = make_pipeline(
+        Normalizer(), SphericalKMeans(n_clusters, random_state=0)
+    )
+    svd_labels, svd_time, svd_peak = measure(svd_route, X)
+    sparse_labels, sparse_time, sparse_peak = measure(sparse_route, X)
+    agreement = "ARI between routes %.3f" % adjusted_rand_score(
+        svd_labels, sparse_labels
+    )
+    if truth is not None:
+        agreement += ", vs truth svd %.3f spherical %.3f" % (
+            adjusted_rand_score(truth, svd_labels),
+            adjusted_rand_score(truth, sparse_labels),
+        )
+    print(
+        "%-10s %-14s svd %7.2fs %7.1f MB  spherical %7.2fs %7.1f MB  %s"
+        % (
+            name,
+            "%dx%d" % X.shape,
+            svd_time,
+            svd_peak / 2**20,
+            sparse_time,
+            sparse_peak / 2**20,
+            agreement,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    articles, _, _ = load_sparse_csv("wikipedia-vectors.csv", transpose=True)
+    compare("articles", articles, 6)
+
+    corpus, topics = topic_corpus(args.rows, n_terms=100000, n_topics=20)
+    compare("synthetic", corpus, 20, truth=topics)
+
+
+if __name__ == "__main__":
+    main()
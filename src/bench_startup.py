@@ -0,0 +1,93 @@
+"""Startup time and peak RSS of loading the datasets three ways.
+
+Each variant runs in a fresh interpreter:
+
+* literal: a module embedding the arrays as np.array([...]) literals, the way
+  script.py used to ship points and new_points;
+* csv: parsing the source files with pandas;
+* mmap: opening the converted .npy files through the datasets registry.
+
+Run from the src directory: python bench_startup.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import datasets
+
+NUMERIC = [
+    name
+    for name in datasets.REGISTRY
+    if name.endswith(("points", "samples", "numbers"))
+    or name in ("movements", "grains", "lcd_digits")
+]
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+print(json.dumps({"seconds": elapsed, "peak_rss": rss}))
+"""
+
+
+def measure(code, cwd, repeat):
+    runs = []
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD % code],
+            cwd=cwd,
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs.append(json.loads(output))
+    return min(run["seconds"] for run in runs), min(run["peak_rss"] for run in runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in NUMERIC:
+        datasets.convert(name)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Module with every dataset written out as a literal
+        with open(os.path.join(tmp, "literal_data.py"), "w") as f:
+            f.write("import numpy as np\n")
+            for name in NUMERIC:
+                f.write("%s = np.array(%r)\n" % (name, datasets.load(name).tolist()))
+
+        variants = {
+            "literal": ("import literal_data", tmp),
+            "csv": (
+                "import datasets\n"
+                + "\n".join("datasets.REGISTRY[%r][1]()" % name for name in NUMERIC),
+                here,
+            ),
+            "mmap": (
+                "import datasets\n"
+                + "\n".join("datasets.load(%r)" % name for name in NUMERIC),
+                here,
+            ),
+        }
+        for variant, (code, cwd) in variants.items():
+            seconds, rss = measure(code, cwd, args.repeat)
+            print(
+                "%-8s %8.1f ms  peak RSS %6.1f MB"
+                % (variant, 1e3 * seconds, rss / 2**20)
+            )
+
+
+if __name__ == "__main__":
+    main()
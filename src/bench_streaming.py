@@ -0,0 +1,92 @@
+"""Compare streaming MiniBatchKMeans against full-batch KMeans.
+
+Run from the src directory: python bench_streaming.py [--rows N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import Normalizer, StandardScaler
+
+from streaming import (
+    iter_array_chunks,
+    make_streaming_pipeline,
+    partial_fit_pipeline,
+    predict_chunks,
+    streaming_inertia,
+)
+
+
+def compare(name, samples, front, n_clusters, chunksize):
+    # Full-batch baseline on the in-memory array
+    start = time.perf_counter()
+    batch = make_pipeline(*front(), KMeans(n_clusters=n_clusters, n_init=10))
+    batch.fit(samples)
+    batch_time = time.perf_counter() - start
+    batch_labels = batch.predict(samples)
+    batch_inertia = batch.steps[-1][1].inertia_
+
+    # Streaming fit over chunks of the same rows
+    def chunks():
+        return iter_array_chunks(samples, chunksize)
+
+    start = time.perf_counter()
+    stream = make_streaming_pipeline(
+        *front(), n_clusters=n_clusters, batch_size=chunksize, random_state=0
+    )
+    partial_fit_pipeline(stream, chunks, n_epochs=3)
+    stream_time = time.perf_counter() - start
+    stream_labels = predict_chunks(stream, chunks)
+    stream_inertia = streaming_inertia(stream, chunks)
+
+    rows = samples.shape[0]
+    print(
+        "%-10s rows=%-8d batch %8.0f rows/s  stream %8.0f rows/s  "
+        "inertia gap %+6.2f%%  ARI %.3f"
+        % (
+            name,
+            rows,
+            rows / batch_time,
+            3 * rows / stream_time,
+            100 * (stream_inertia - batch_inertia) / batch_inertia,
+            adjusted_rand_score(batch_labels, stream_labels),
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunksize", type=int, default=10000)
+    args = parser.parse_args()
+
+    seeds = pd.read_csv("seeds.csv", header=None).iloc[:, :-1].values
+    fish = pd.read_csv("fish.csv", header=None).iloc[:, 1:].values
+    movements = pd.read_csv(
+        "company-stock-movements-2010-2015-incl.csv", index_col=0
+    ).values
+
+    compare("seeds", seeds, lambda: [], 3, 64)
+    compare("fish", fish, lambda: [StandardScaler()], 4, 32)
+    compare("stocks", movements, lambda: [Normalizer()], 10, 16)
+
+    # Synthetic point set served from a memory-mapped file
+    points, _ = make_blobs(args.rows, n_features=10, centers=8, random_state=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "points.npy")
+        np.save(path, points)
+        del points
+        mapped = np.load(path, mmap_mode="r")
+        compare("synthetic", mapped, lambda: [StandardScaler()], 8, args.chunksize)
+
+
+if __name__ == "__main__":
+    main()
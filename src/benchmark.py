@@ -0,0 +1,343 @@
+"""Benchmark suite covering every estimator stage of script.py.
+
+Each benchmark scales a bundled dataset up by --scale (rows are tiled with
+small Gaussian jitter, so the cluster structure is preserved), runs the
+stage, and records wall time, CPU time, traced peak memory and a quality
+metric. Times are taken with tracemalloc off, since tracing slows
+allocation-heavy stages considerably; peak memory comes from one extra
+traced run. Results are written as JSON; with --baseline the run is
+compared against a saved result file and exits non-zero when a stage got
+slower than --tolerance allows. The baseline must have the same --scale;
+a different Python, CPU count or numpy, scipy or scikit-learn version only
+draws a warning. Everything runs offline on CPU.
+
+Run from the src directory:
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --baseline baseline.json [--only kmeans-seeds ...]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import scipy
+import sklearn
+from scipy import sparse
+from scipy.cluster.hierarchy import fcluster
+from sklearn.cluster import KMeans
+from sklearn.decomposition import NMF, PCA, TruncatedSVD
+from sklearn.manifold import TSNE, trustworthiness
+from sklearn.metrics import adjusted_rand_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MaxAbsScaler, Normalizer, StandardScaler
+
+import datasets
+from hierarchy import linkage
+from instrument import Recorder
+from scrobbler import ingest_scrobbles
+from similarity import SimilarityIndex
+from sparse_csv import load_sparse_csv
+
+
+def scale_up(X, scale, rng, noise=0.01):
+    """Tile the rows of X scale times, jittering every copy but the first."""
+    if sparse.issparse(X):
+        copies = [X]
+        for _ in range(scale - 1):
+            copy = X.copy().astype(np.float64)
+            copy.data *= 1 + noise * rng.standard_normal(copy.nnz)
+            copies.append(copy)
+        return sparse.vstack(copies, format="csr")
+    X = np.asarray(X, dtype=np.float64)
+    jitter = (
+        noise
+        * X.std(axis=0)
+        * rng.standard_normal((X.shape[0] * (scale - 1), X.shape[1]))
+    )
+    return np.vstack([X, np.tile(X, (scale - 1, 1)) + jitter])
+
+
+def tile_labels(labels, scale):
+    return np.tile(np.asarray(labels), scale)
+
+
+def _articles():
+    return load_sparse_csv("wikipedia-vectors.csv", transpose=True)[0]
+
+
+def _artists():
+    return ingest_scrobbles("scrobbler-small-sample.csv")[0]
+
+
+# Each benchmark is (prepare(scale, rng) -> data, run(data) -> quality metrics);
+# only run is timed.
+
+
+def _kmeans_points(scale, rng):
+    return scale_up(datasets.load("points"), scale, rng)
+
+
+def _run_kmeans_points(points):
+    model = KMeans(n_clusters=3, n_init=10).fit(points)
+    return {"inertia_per_sample": model.inertia_ / len(points)}
+
+
+def _kmeans_seeds(scale, rng):
+    samples = scale_up(datasets.load("seeds_samples"), scale, rng)
+    return samples, tile_labels(datasets.load("seeds_variety_numbers"), scale)
+
+
+def _run_kmeans_seeds(data):
+    samples, varieties = data
+    labels = KMeans(n_clusters=3, n_init=10).fit_predict(samples)
+    return {"ari": adjusted_rand_score(varieties, labels)}
+
+
+def _fish(scale, rng):
+    samples = scale_up(datasets.load("fish_samples"), scale, rng)
+    return samples, tile_labels(datasets.load("fish_species"), scale)
+
+
+def _run_fish(data):
+    samples, species = data
+    pipeline = make_pipeline(StandardScaler(), KMeans(n_clusters=4, n_init=10))
+    labels = pipeline.fit(samples).predict(samples)
+    return {"ari": adjusted_rand_score(species, labels)}
+
+
+def _stocks(scale, rng):
+    return scale_up(datasets.load("movements"), scale, rng)
+
+
+def _run_stocks(movements):
+    pipeline = make_pipeline(Normalizer(), KMeans(n_clusters=10, n_init=10))
+    pipeline.fit(movements)
+    return {"inertia": pipeline.steps[-1][1].inertia_}
+
+
+def _run_inertia_sweep(data):
+    samples, _ = data
+    inertias = [
+        KMeans(n_clusters=k, n_init=10).fit(samples).inertia_ for k in range(1, 6)
+    ]
+    return {"inertia_ratio_k3_k1": inertias[2] / inertias[0]}
+
+
+def _run_linkage(data):
+    samples, varieties = data
+    mergings = linkage(samples, method="complete")
+    labels = fcluster(mergings, 6, criterion="distance")
+    return {"ari": adjusted_rand_score(varieties, labels)}
+
+
+def _run_tsne(data):
+    samples, _ = data
+    features = TSNE(learning_rate=200, init="random").fit_transform(samples)
+    subset = slice(0, min(len(samples), 2000))
+    return {"trustworthiness": trustworthiness(samples[subset], features[subset])}
+
+
+def _run_pca(data):
+    samples, _ = data
+    pca = PCA()
+    make_pipeline(StandardScaler(), pca).fit(samples)
+    return {
+        "explained_variance_ratio_2": float(pca.explained_variance_ratio_[:2].sum())
+    }
+
+
+def _articles_scaled(scale, rng):
+    return scale_up(_articles(), scale, rng)
+
+
+def _run_svd_kmeans(articles):
+    pipeline = make_pipeline(
+        TruncatedSVD(n_components=50), KMeans(n_clusters=6, n_init=10)
+    )
+    pipeline.fit(articles)
+    return {"inertia": pipeline.steps[-1][1].inertia_}
+
+
+def _run_nmf_articles(articles):
+    model = NMF(n_components=6, max_iter=500).fit(articles)
+    return {"reconstruction_err": model.reconstruction_err_}
+
+
+def _digits(scale, rng):
+    return np.abs(scale_up(datasets.load("lcd_digits"), scale, rng))
+
+
+def _run_nmf_digits(samples):
+    model = NMF(n_components=7, max_iter=500).fit(samples)
+    return {"reconstruction_err": model.reconstruction_err_}
+
+
+def _artists_scaled(scale, rng):
+    return scale_up(_artists(), scale, rng)
+
+
+def _run_nmf_artists(artists):
+    nmf = NMF(n_components=20, max_iter=500)
+    make_pipeline(MaxAbsScaler(), nmf, Normalizer()).fit_transform(artists)
+    return {"reconstruction_err": nmf.reconstruction_err_}
+
+
+def _features(scale, rng):
+    features = np.abs(rng.standard_normal((60 * scale * 100, 20)))
+    return features / np.linalg.norm(features, axis=1, keepdims=True)
+
+
+def _run_cosine_lookup(features):
+    index = SimilarityIndex(features)
+    queries = np.arange(min(len(features), 1000))
+    start = time.perf_counter()
+    rows, _ = index.query_labels(queries, k=5)
+    elapsed = time.perf_counter() - start
+    # Every query's best match is the item itself
+    return {
+        "queries_per_sec": len(queries) / elapsed,
+        "self_recall": float((rows[:, 0] == queries).mean()),
+    }
+
+
+BENCHMARKS = {
+    "kmeans-points": (_kmeans_points, _run_kmeans_points),
+    "kmeans-seeds": (_kmeans_seeds, _run_kmeans_seeds),
+    "fish-pipeline": (_fish, _run_fish),
+    "stock-pipeline": (_stocks, _run_stocks),
+    "inertia-sweep": (_kmeans_seeds, _run_inertia_sweep),
+    "linkage-fcluster": (_kmeans_seeds, _run_linkage),
+    "tsne": (_kmeans_seeds, _run_tsne),
+    "pca": (_fish, _run_pca),
+    "svd-kmeans": (_articles_scaled, _run_svd_kmeans),
+    "nmf-articles": (_articles_scaled, _run_nmf_articles),
+    "nmf-digits": (_digits, _run_nmf_digits),
+    "nmf-artists": (_artists_scaled, _run_nmf_artists),
+    "cosine-lookup": (_features, _run_cosine_lookup),
+}
+
+
+def run(names, scale, repeat, seed=0):
+    """Run the named benchmarks and return their results keyed by name."""
+    results = {}
+    for name in names:
+        prepare, stage = BENCHMARKS[name]
+        data = prepare(scale, np.random.RandomState(seed))
+        timer = Recorder(trace_memory=False)
+        shape_data = data[0] if isinstance(data, tuple) else data
+        for _ in range(repeat):
+            with timer.stage(name, shape_data):
+                quality = stage(data)
+        tracer = Recorder()
+        with tracer.stage(name, shape_data):
+            stage(data)
+        best = min(timer.records, key=lambda record: record["wall_seconds"])
+        results[name] = {
+            "wall_seconds": best["wall_seconds"],
+            "cpu_seconds": best["cpu_seconds"],
+            "peak_memory_bytes": tracer.records[0]["peak_memory_bytes"],
+            "input_shape": best["input_shape"],
+            "quality": quality,
+        }
+        print(
+            "%-18s %9.3fs %9.1f MB  %s"
+            % (
+                name,
+                best["wall_seconds"],
+                results[name]["peak_memory_bytes"] / 2**20,
+                ", ".join("%s=%.4g" % item for item in quality.items()),
+            ),
+            flush=True,
+        )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a message for every stage slower than baseline by > tolerance."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["wall_seconds"]
+        after = result["wall_seconds"]
+        if after > before * (1 + tolerance):
+            regressions.append(
+                "%s: %.3fs -> %.3fs (%+.0f%%)"
+                % (name, before, after, 100 * (after / before - 1))
+            )
+    return regressions
+
+
+def environment():
+    """Return what besides the code decides the timings of this machine."""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def mismatches(meta, baseline_meta):
+    """Return "key: baseline -> current" for every environment difference."""
+    return [
+        "%s: %s -> %s" % (key, baseline_meta.get(key), meta[key])
+        for key in environment()
+        if baseline_meta.get(key) != meta[key]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    baseline = None
+    meta = dict(scale=args.scale, repeat=args.repeat, **environment())
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Timings at another scale cannot be compared at all; another
+        # environment makes the verdict doubtful
+        if baseline["meta"].get("scale") != args.scale:
+            sys.exit(
+                "baseline was recorded at --scale %s, rerun with that scale"
+                % baseline["meta"].get("scale")
+            )
+        differences = mismatches(meta, baseline["meta"])
+        if differences:
+            print(
+                "warning: baseline environment differs:\n  " + "\n  ".join(differences),
+                file=sys.stderr,
+            )
+
+    results = run(args.only or list(BENCHMARKS), args.scale, args.repeat)
+    meta["timestamp"] = time.time()
+    document = {"meta": meta, "results": results}
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(document, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            sys.exit("slower than baseline:\n  " + "\n  ".join(regressions))
+        print("no regressions against %s" % args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Helpers for the on-disk cache shared by the loaders and analyses."""
+
+import hashlib
+import os
+
+import numpy as np
+
+# Default location of cached artefacts, next to the datasets
+CACHE_DIR = os.environ.get(
+    "UNSUPERVISED_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+
+
+def file_digest(path, block_size=1 << 20):
+    """Return the SHA-1 hex digest of the file at path."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stat_digest(path):
+    """Return a SHA-1 hex digest of the absolute path, size and mtime of path.
+
+    Cheaper than file_digest for large files, at the cost of trusting the
+    modification time.
+    """
+    stat = os.stat(path)
+    key = "%s\0%d\0%d" % (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def cache_path(name, key, suffix, cache_dir=None):
+    """Return the path of a cache entry, creating the cache directory."""
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, "%s-%s%s" % (name, key[:16], suffix))
+
+
+def array_digest(*arrays):
+    """Return a SHA-1 hex digest of the shapes, dtypes and bytes of arrays."""
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(("%s%s" % (array.shape, array.dtype)).encode())
+        digest.update(array.data)
+    return digest.hexdigest()
@@ -0,0 +1,146 @@
+"""Run selected sections of script.py, importing only what they need.
+
+    python cli.py --list
+    python cli.py kmeans-points fish-pipeline
+    python cli.py --all --plots figures --import-times
+
+Nothing heavier than numpy is imported until an analysis runs. With
+--import-times the seconds spent importing each top-level package are
+reported per analysis, alongside its run time. --plots writes figures to a
+directory through render.use_headless; --show opens them in windows.
+Without either, analyses skip plotting and never import matplotlib.
+--record appends the wall time, CPU time, peak memory and input shape of
+every analysis and of the sections.py steps it runs to a JSON lines file.
+"""
+
+import argparse
+import builtins
+import sys
+import time
+
+import instrument
+from analyses import ANALYSES
+
+
+class ImportTimer:
+    """Attribute first-time imports to top-level packages while active.
+
+    Time is charged to the package named in the outermost import statement,
+    so importing sklearn counts the scipy and numpy modules it pulls in.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self._depth = 0
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or self._depth or name in sys.modules:
+            self._depth += 1
+            try:
+                return self._original(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            package = name.partition(".")[0]
+            self.seconds[package] = (
+                self.seconds.get(package, 0.0) + time.perf_counter() - start
+            )
+
+    def __enter__(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc_info):
+        builtins.__import__ = self._original
+
+
+def run(names, plots=False, import_times=False, recorder=None):
+    """Run the named analyses, returning {name: (seconds, import seconds)}.
+
+    With a recorder, each analysis and the sections it runs are recorded as
+    stages.
+    """
+    previous = instrument.activate(recorder)
+    try:
+        return _run(names, plots, import_times, recorder)
+    finally:
+        instrument.activate(previous)
+
+
+def _run(names, plots, import_times, recorder):
+    timings = {}
+    for name in names:
+        print("== %s" % name)
+        start = time.perf_counter()
+        with ImportTimer() as timer:
+            if recorder is None:
+                ANALYSES[name](plots=plots)
+            else:
+                with recorder.stage(name):
+                    ANALYSES[name](plots=plots)
+        elapsed = time.perf_counter() - start
+        timings[name] = (elapsed, timer.seconds)
+        if import_times:
+            print(
+                "-- %s: %.2fs, of which imports %.2fs"
+                % (name, elapsed, sum(timer.seconds.values()))
+            )
+            for package, seconds in sorted(
+                timer.seconds.items(), key=lambda item: -item[1]
+            ):
+                print("     %-20s %6.3fs" % (package, seconds))
+    return timings
+
+
+def main():
+    started = time.perf_counter()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("analyses", nargs="*", metavar="analysis")
+    parser.add_argument("--all", action="store_true")
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--plots", metavar="DIR")
+    parser.add_argument("--show", action="store_true")
+    parser.add_argument("--import-times", action="store_true")
+    parser.add_argument("--record", metavar="PATH")
+    args = parser.parse_args()
+
+    unknown = sorted(set(args.analyses) - set(ANALYSES))
+    if unknown:
+        parser.error("unknown analyses %s, see --list" % ", ".join(map(repr, unknown)))
+    if args.list or not (args.analyses or args.all):
+        for name, function in ANALYSES.items():
+            print("%-16s %s" % (name, function.__doc__.splitlines()[0]))
+        return
+
+    if args.plots:
+        with ImportTimer() as timer:
+            from render import use_headless
+
+            use_headless(args.plots)
+        if args.import_times:
+            print("-- figure setup imports %.2fs" % sum(timer.seconds.values()))
+    recorder = None
+    if args.record:
+        recorder = instrument.Recorder()
+    run(
+        list(ANALYSES) if args.all else args.analyses,
+        plots=bool(args.plots or args.show),
+        import_times=args.import_times,
+        recorder=recorder,
+    )
+    if recorder is not None:
+        recorder.write_jsonl(args.record)
+    if args.import_times:
+        print("-- total %.2fs" % (time.perf_counter() - started))
+
+
+if __name__ == "__main__":
+    main()
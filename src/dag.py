@@ -0,0 +1,333 @@
+"""Run the independent sections of script.py in parallel as a stage graph.
+
+Every stage declares the names of the values it consumes and produces, for
+example normalize_movements produces normalized_movements, which both
+stock_linkage and stock_tsne consume. A stage's function is called with its
+inputs as keyword arguments and returns its output, or a tuple of them when
+it declares several; the suite below runs the functions of sections.py. run() starts each stage on a process
+pool as soon as all of its inputs exist, so unrelated chains overlap and the
+wall-clock time of the whole suite approaches that of its longest chain.
+
+Output arrays of at least min_shared_bytes are written once to shared memory
+by the stage that produced them. Every consumer attaches to the same block
+instead of receiving a pickled copy, and the block is freed when the last
+consumer has finished. Other values, sparse matrices included, are pickled.
+
+With record=True (--record PATH) each worker records the sections.py
+functions its stage runs with an instrument.Recorder, and the records come
+back in DagResult.records.
+
+Run from the src directory: python dag.py [--jobs N] [--only STAGE ...]
+[--record PATH]
+"""
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+import datasets
+import instrument
+import sections
+
+Stage = namedtuple("Stage", ["name", "function", "inputs", "outputs"])
+
+DagResult = namedtuple("DagResult", ["outputs", "seconds", "wall_seconds", "records"])
+
+# Stands in for an array that lives in a shared memory block
+Shared = namedtuple("Shared", ["name", "shape", "dtype"])
+
+
+def _share(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    block.close()
+    return Shared(block.name, array.shape, array.dtype.str)
+
+
+def _execute(stage, values, min_shared_bytes, threads, record):
+    blocks, kwargs = [], {}
+    recorder = instrument.Recorder() if record else None
+    try:
+        for name, value in values.items():
+            if isinstance(value, Shared):
+                block = shared_memory.SharedMemory(name=value.name)
+                blocks.append(block)
+                value = np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf)
+                value.flags.writeable = False
+            kwargs[name] = value
+        value = None
+
+        start = time.perf_counter()
+        previous = instrument.activate(recorder)
+        try:
+            with threadpool_limits(limits=threads):
+                outputs = stage.function(**kwargs)
+        finally:
+            instrument.activate(previous)
+        seconds = time.perf_counter() - start
+
+        # One declared output takes the whole result, several unpack it
+        if len(stage.outputs) == 1:
+            outputs = (outputs,)
+        outputs = tuple(outputs)
+        if len(outputs) != len(stage.outputs):
+            raise ValueError(
+                "stage %r returned %d values, declared %s"
+                % (stage.name, len(outputs), list(stage.outputs))
+            )
+        outputs = dict(zip(stage.outputs, outputs))
+        for name, value in outputs.items():
+            if isinstance(value, np.ndarray):
+                if value.nbytes >= min_shared_bytes:
+                    outputs[name] = _share(value)
+                elif not value.flags.owndata:
+                    # May be a view of an input block, which is closed below
+                    outputs[name] = value.copy()
+        value = None
+        return outputs, seconds, [] if recorder is None else recorder.records
+    finally:
+        kwargs.clear()
+        for block in blocks:
+            block.close()
+
+
+def _fetch(value):
+    if not isinstance(value, Shared):
+        return value
+    block = shared_memory.SharedMemory(name=value.name)
+    try:
+        return np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf).copy()
+    finally:
+        block.close()
+
+
+def _free(value):
+    if isinstance(value, Shared):
+        block = shared_memory.SharedMemory(name=value.name)
+        block.close()
+        block.unlink()
+
+
+def _check(stages):
+    producers = {}
+    for stage in stages:
+        for name in stage.outputs:
+            if name in producers:
+                raise ValueError(
+                    "%r is produced by both %r and %r"
+                    % (name, producers[name], stage.name)
+                )
+            producers[name] = stage.name
+    for stage in stages:
+        missing = set(stage.inputs) - set(producers)
+        if missing:
+            raise ValueError(
+                "stage %r needs %s, which no stage produces"
+                % (stage.name, sorted(missing))
+            )
+    return producers
+
+
+def run(stages, keep=None, n_jobs=None, min_shared_bytes=2**16, record=False):
+    """Run stages in dependency order and return a DagResult.
+
+    keep names the values to return, by default every value no stage
+    consumes. seconds maps each stage to its own run time. With record, the
+    instrument records of every stage are returned as well.
+    """
+    stages = list(stages)
+    _check(stages)
+    consumers = {}
+    for stage in stages:
+        for name in stage.inputs:
+            consumers[name] = consumers.get(name, 0) + 1
+    if keep is None:
+        keep = [
+            name for stage in stages for name in stage.outputs if name not in consumers
+        ]
+    keep = set(keep)
+
+    n_jobs = os.cpu_count() if n_jobs is None else n_jobs
+    n_jobs = max(1, min(n_jobs, len(stages)))
+    threads = max(1, (os.cpu_count() or 1) // n_jobs)
+    values, seconds, records = {}, {}, []
+    pending = list(stages)
+    running = {}
+    # Workers must report their blocks to this process's tracker, not start
+    # their own, which would unlink the blocks when the worker exits
+    resource_tracker.ensure_running()
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            while pending or running:
+                for stage in [s for s in pending if set(s.inputs) <= set(values)]:
+                    pending.remove(stage)
+                    inputs = {name: values[name] for name in stage.inputs}
+                    future = pool.submit(
+                        _execute, stage, inputs, min_shared_bytes, threads, record
+                    )
+                    running[future] = stage
+                if not running:
+                    raise ValueError(
+                        "stages %s depend on each other in a cycle"
+                        % sorted(stage.name for stage in pending)
+                    )
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    outputs, seconds[stage.name], stage_records = future.result()
+                    records.extend(stage_records)
+                    values.update(outputs)
+                    # Free inputs that no remaining stage needs
+                    for name in stage.inputs:
+                        consumers[name] -= 1
+                        if not consumers[name] and name not in keep:
+                            _free(values.pop(name))
+        outputs = {name: _fetch(values[name]) for name in keep if name in values}
+    finally:
+        for value in values.values():
+            _free(value)
+    return DagResult(outputs, seconds, time.perf_counter() - start, records)
+
+
+def critical_path(stages, seconds):
+    """Return the summed run time of the slowest chain of dependent stages."""
+    producers = _check(stages)
+    by_name = {stage.name: stage for stage in stages}
+    finish = {}
+
+    def finish_time(name):
+        if name not in finish:
+            stage = by_name[name]
+            finish[name] = seconds[name] + max(
+                [finish_time(producers[value]) for value in stage.inputs], default=0.0
+            )
+        return finish[name]
+
+    return max(finish_time(stage.name) for stage in stages)
+
+
+# The sections of script.py as stages, taken straight from sections.py.
+# Datasets are read from their memory-mapped .npy files, so loading them is
+# not a stage of its own.
+SUITE = [
+    Stage(
+        "normalize_movements",
+        sections.normalized_movements,
+        (),
+        ("normalized_movements",),
+    ),
+    Stage("stock_clusters", sections.stock_labels, (), ("stock_labels",)),
+    Stage(
+        "stock_linkage",
+        sections.stock_mergings,
+        ("normalized_movements",),
+        ("stock_mergings",),
+    ),
+    Stage(
+        "stock_tsne", sections.stock_tsne, ("normalized_movements",), ("stock_tsne",)
+    ),
+    Stage(
+        "seeds_subset",
+        sections.seeds_subset,
+        (),
+        ("seeds_subset_samples", "seeds_subset_varieties"),
+    ),
+    Stage(
+        "seeds_linkage",
+        sections.seeds_mergings,
+        ("seeds_subset_samples",),
+        ("seeds_mergings",),
+    ),
+    Stage("seeds_cut", sections.seeds_cut, ("seeds_mergings",), ("seeds_labels",)),
+    Stage("seeds_tsne", sections.seeds_tsne, (), ("seeds_tsne",)),
+    Stage(
+        "eurovision_subset",
+        sections.eurovision_subset,
+        (),
+        ("eurovision_subset_samples", "eurovision_subset_countries"),
+    ),
+    Stage(
+        "eurovision_linkage",
+        sections.eurovision_mergings,
+        ("eurovision_subset_samples",),
+        ("eurovision_mergings",),
+    ),
+    Stage("grains_pca", sections.grains_pca, (), ("grains_pca",)),
+    Stage("wikipedia", sections.wikipedia, (), ("articles", "titles")),
+    Stage(
+        "article_clusters", sections.article_labels, ("articles",), ("article_labels",)
+    ),
+    Stage(
+        "article_nmf",
+        sections.article_nmf,
+        ("articles",),
+        ("nmf_features", "nmf_components"),
+    ),
+    Stage(
+        "article_similarities",
+        sections.article_similarities,
+        ("nmf_features", "titles"),
+        ("article_similarities",),
+    ),
+    Stage("digit_nmf", sections.digit_nmf, (), ("digit_features", "digit_components")),
+    Stage("digit_pca", sections.digit_pca_components, (), ("digit_pca_components",)),
+    Stage("artist_features", sections.artist_features, (), ("artist_features",)),
+    Stage(
+        "artist_similarities",
+        sections.artist_similarities,
+        ("artist_features",),
+        ("artist_similarities",),
+    ),
+]
+
+
+def _with_dependencies(stages, names):
+    producers = _check(stages)
+    by_name = {stage.name: stage for stage in stages}
+    needed, todo = set(), list(names)
+    while todo:
+        name = todo.pop()
+        if name not in needed:
+            needed.add(name)
+            todo.extend(producers[value] for value in by_name[name].inputs)
+    return [stage for stage in stages if stage.name in needed]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int)
+    parser.add_argument("--only", nargs="+", choices=[stage.name for stage in SUITE])
+    parser.add_argument("--record", metavar="PATH")
+    args = parser.parse_args()
+
+    stages = _with_dependencies(SUITE, args.only) if args.only else SUITE
+    # Convert the datasets up front so stages never race to write the cache
+    for name in datasets.REGISTRY:
+        datasets.convert(name)
+
+    result = run(stages, n_jobs=args.jobs, record=bool(args.record))
+    if args.record:
+        recorder = instrument.Recorder()
+        recorder.records = result.records
+        recorder.write_jsonl(args.record)
+    for stage in stages:
+        print("%-22s %7.2fs" % (stage.name, result.seconds[stage.name]))
+    print(
+        "wall %.2fs, sum of stages %.2fs, longest chain %.2fs"
+        % (
+            result.wall_seconds,
+            sum(result.seconds.values()),
+            critical_path(stages, result.seconds),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Registry of the bundled datasets, stored as memory-mapped .npy files.
+
+Each dataset is converted from its source CSV once and written to the cache
+directory as a .npy file. Later loads open it with np.load(mmap_mode="r"),
+which returns a read-only, lazily paged array without parsing or copying
+anything. A cache entry is keyed by the size and modification time of its
+source, so editing a CSV triggers a fresh conversion. pandas is only
+imported when a conversion is actually needed.
+"""
+
+import os
+
+import numpy as np
+
+from cache import cache_path, stat_digest
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SEED_VARIETIES = {1: "Kama wheat", 2: "Rosa wheat", 3: "Canadian wheat"}
+
+
+def _read_csv(filename, **kwargs):
+    import pandas as pd
+
+    return pd.read_csv(os.path.join(DATA_DIR, filename), **kwargs)
+
+
+def _seeds():
+    return _read_csv("seeds_dataset.txt", header=None, sep=r"\s+")
+
+
+def _eurovision():
+    return _read_csv("eurovision-2016.csv")
+
+
+def _movements():
+    return _read_csv("company-stock-movements-2010-2015-incl.csv", index_col=0)
+
+
+# Dataset name -> (source file, function returning the array)
+REGISTRY = {
+    "points": (
+        "points.csv",
+        lambda: _read_csv("points.csv", header=None).to_numpy(np.float64),
+    ),
+    "new_points": (
+        "new-points.csv",
+        lambda: _read_csv("new-points.csv", header=None).to_numpy(np.float64),
+    ),
+    "seeds_samples": (
+        "seeds_dataset.txt",
+        lambda: _seeds().iloc[:, :-1].to_numpy(np.float64),
+    ),
+    "seeds_variety_numbers": (
+        "seeds_dataset.txt",
+        lambda: _seeds().iloc[:, -1].to_numpy(np.int64),
+    ),
+    "seeds_varieties": (
+        "seeds_dataset.txt",
+        lambda: _seeds().iloc[:, -1].map(SEED_VARIETIES).to_numpy(str),
+    ),
+    "fish_samples": (
+        "fish.csv",
+        lambda: _read_csv("fish.csv", header=None).iloc[:, 1:].to_numpy(np.float64),
+    ),
+    "fish_species": (
+        "fish.csv",
+        lambda: _read_csv("fish.csv", header=None).iloc[:, 0].to_numpy(str),
+    ),
+    "movements": (
+        "company-stock-movements-2010-2015-incl.csv",
+        lambda: _movements().to_numpy(np.float64),
+    ),
+    "companies": (
+        "company-stock-movements-2010-2015-incl.csv",
+        lambda: _movements().index.to_numpy(str),
+    ),
+    "eurovision_samples": (
+        "eurovision-2016.csv",
+        lambda: _eurovision().iloc[:, 2:7].to_numpy(np.float64),
+    ),
+    "eurovision_countries": (
+        "eurovision-2016.csv",
+        lambda: _eurovision().iloc[:, 1].to_numpy(str),
+    ),
+    "grains": (
+        "seeds-width-vs-length.csv",
+        lambda: _read_csv("seeds-width-vs-length.csv", header=None).to_numpy(
+            np.float64
+        ),
+    ),
+    "lcd_digits": (
+        "lcd-digits.csv",
+        lambda: _read_csv("lcd-digits.csv", header=None).to_numpy(np.float64),
+    ),
+    "artist_names": (
+        "artists.csv",
+        lambda: _read_csv("artists.csv", header=None).iloc[:, 0].to_numpy(str),
+    ),
+}
+
+
+def _entry(name, cache_dir=None):
+    filename, _ = REGISTRY[name]
+    key = stat_digest(os.path.join(DATA_DIR, filename))
+    return cache_path(name, key, ".npy", cache_dir)
+
+
+def convert(name, cache_dir=None):
+    """Convert a dataset from its source file and return the .npy path."""
+    if name not in REGISTRY:
+        raise KeyError(
+            "unknown dataset %r, expected one of %s" % (name, sorted(REGISTRY))
+        )
+    entry = _entry(name, cache_dir)
+    if not os.path.exists(entry):
+        _, read = REGISTRY[name]
+        tmp = entry + ".tmp.npy"
+        np.save(tmp, np.ascontiguousarray(read()))
+        os.replace(tmp, entry)
+    return entry
+
+
+def load(name, cache_dir=None):
+    """Return the named dataset as a read-only memory-mapped array."""
+    return np.load(convert(name, cache_dir), mmap_mode="r")
@@ -0,0 +1,318 @@
+"""Data-parallel KMeans over shards held by separate worker processes.
+
+Each worker owns one shard of the rows and answers requests from the
+coordinator over a multiprocessing.connection socket, so a worker may be a
+local process or a server on another node (python distributed_kmeans.py
+serve --port N there). Per Lloyd iteration every worker returns the
+per-cluster sums, counts and inertia of its shard for the current centroids,
+and the coordinator reduces them into the next centroids. Only k x d sized
+messages cross the wire after the shards are loaded.
+
+Initialization is k-means|| (Bahmani et al., 2012): starting from one random
+row, each round every worker samples its rows with probability proportional
+to their squared distance from the candidates so far. The candidates are
+then weighted by the number of rows closest to them, and the coordinator
+reduces them to n_clusters centres with a weighted k-means++ KMeans.
+"""
+
+import argparse
+import os
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClusterMixin, TransformerMixin
+from sklearn.cluster import KMeans
+from threadpoolctl import threadpool_limits
+
+
+class _Shard:
+    """The rows held by one worker and the requests it answers."""
+
+    def __init__(self, block_size):
+        self.block_size = block_size
+        self.rows = np.empty((0, 0))
+        self.squared_norms = np.empty(0)
+
+    def load(self, rows):
+        if isinstance(rows, str):
+            rows = np.load(rows, mmap_mode="r")
+        self.rows = np.asarray(rows, dtype=np.float64)
+        self.squared_norms = np.einsum("ij,ij->i", self.rows, self.rows)
+        return len(self.rows)
+
+    def _nearest(self, centers):
+        # Squared distance to and index of the nearest centre, block by block
+        center_norms = (centers**2).sum(axis=1)
+        for start in range(0, len(self.rows), self.block_size):
+            rows = self.rows[start : start + self.block_size]
+            distances = (
+                self.squared_norms[start : start + self.block_size, None]
+                - 2 * rows @ centers.T
+                + center_norms[None, :]
+            )
+            labels = np.argmin(distances, axis=1)
+            closest = np.maximum(distances[np.arange(len(rows)), labels], 0)
+            yield start, rows, labels, closest
+
+    def stats(self):
+        return len(self.rows), self.rows.sum(axis=0), (self.rows**2).sum(axis=0)
+
+    def row(self, index):
+        return np.array(self.rows[index])
+
+    def cost(self, centers):
+        return sum(closest.sum() for _, _, _, closest in self._nearest(centers))
+
+    def oversample(self, centers, factor, total_cost, seed):
+        rng = np.random.RandomState(seed)
+        chosen = []
+        for _, rows, _, closest in self._nearest(centers):
+            keep = rng.random_sample(len(rows)) < factor * closest / total_cost
+            chosen.append(rows[keep])
+        return np.concatenate(chosen) if chosen else np.empty((0, centers.shape[1]))
+
+    def weights(self, centers):
+        counts = np.zeros(len(centers))
+        for _, _, labels, _ in self._nearest(centers):
+            counts += np.bincount(labels, minlength=len(centers))
+        return counts
+
+    def step(self, centers):
+        sums = np.zeros_like(centers)
+        counts = np.zeros(len(centers))
+        inertia = 0.0
+        for _, rows, labels, closest in self._nearest(centers):
+            membership = sparse.csr_matrix(
+                (np.ones(len(rows)), (labels, np.arange(len(rows)))),
+                shape=(len(centers), len(rows)),
+            )
+            sums += membership @ rows
+            counts += np.bincount(labels, minlength=len(centers))
+            inertia += closest.sum()
+        return sums, counts, inertia
+
+    def assign(self, centers):
+        labels = np.empty(len(self.rows), dtype=np.int32)
+        inertia = 0.0
+        for start, rows, block_labels, closest in self._nearest(centers):
+            labels[start : start + len(rows)] = block_labels
+            inertia += closest.sum()
+        return labels, inertia
+
+
+def serve(address, authkey, threads=None, block_size=65536, ready=None):
+    """Answer coordinator requests on address until told to shut down.
+
+    Requests are (method, *args) tuples naming a _Shard method; the reply is
+    its return value, or the exception it raised. ready, if given, is a
+    connection that receives the bound address once the listener is up.
+    """
+    shard = _Shard(block_size)
+    with Listener(address, authkey=authkey) as listener:
+        if ready is not None:
+            ready.send(listener.address)
+            ready.close()
+        with threadpool_limits(limits=threads):
+            while True:
+                with listener.accept() as conn:
+                    while True:
+                        try:
+                            method, *args = conn.recv()
+                        except EOFError:
+                            break
+                        if method == "shutdown":
+                            return
+                        try:
+                            conn.send(getattr(shard, method)(*args))
+                        except Exception as error:
+                            conn.send(error)
+
+
+def start_local_workers(n_workers, authkey, threads=None):
+    """Start n_workers serve() processes on localhost; return (processes, addresses)."""
+    if threads is None:
+        threads = max(1, (os.cpu_count() or 1) // n_workers)
+    processes, addresses = [], []
+    for _ in range(n_workers):
+        receive, send = Pipe(duplex=False)
+        process = Process(
+            target=serve,
+            args=(("localhost", 0), authkey, threads),
+            kwargs={"ready": send},
+            daemon=True,
+        )
+        process.start()
+        addresses.append(receive.recv())
+        processes.append(process)
+    return processes, addresses
+
+
+class DistributedKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
+    """KMeans whose rows are split across worker processes.
+
+    With addresses=None, n_workers local worker processes are started for
+    the fit and stopped afterwards. Otherwise addresses lists running serve()
+    workers, all sharing authkey. fit(X) splits X into one contiguous shard
+    per worker. X may also be a list of .npy paths, one per worker, that each
+    worker opens itself. labels_ come back in shard order, and the k-means||
+    centres the iterations started from are kept as init_centers_.
+    """
+
+    def __init__(
+        self,
+        n_clusters=8,
+        max_iter=300,
+        tol=1e-4,
+        oversampling_factor=2.0,
+        n_rounds=5,
+        n_workers=2,
+        addresses=None,
+        authkey=None,
+        random_state=None,
+    ):
+        self.n_clusters = n_clusters
+        self.max_iter = max_iter
+        self.tol = tol
+        self.oversampling_factor = oversampling_factor
+        self.n_rounds = n_rounds
+        self.n_workers = n_workers
+        self.addresses = addresses
+        self.authkey = authkey
+        self.random_state = random_state
+
+    def _map(self, method, *per_worker):
+        # Send every worker its request before waiting on any reply
+        for i, conn in enumerate(self._connections):
+            conn.send((method,) + tuple(args[i] for args in per_worker))
+        replies = [conn.recv() for conn in self._connections]
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+        return replies
+
+    def _broadcast(self, method, *args):
+        return self._map(method, *([arg] * len(self._connections) for arg in args))
+
+    def _init_centers(self, rng):
+        sizes = np.array(self._sizes)
+        # One uniformly random row to start from
+        worker = rng.choice(len(sizes), p=sizes / sizes.sum())
+        conn = self._connections[worker]
+        conn.send(("row", rng.randint(sizes[worker])))
+        candidates = conn.recv()[None, :]
+
+        factor = self.oversampling_factor * self.n_clusters
+        for _ in range(self.n_rounds):
+            total_cost = sum(self._broadcast("cost", candidates))
+            if total_cost == 0:
+                break
+            seeds = rng.randint(np.iinfo(np.int32).max, size=len(self._connections))
+            chosen = self._map(
+                "oversample",
+                [candidates] * len(seeds),
+                [factor] * len(seeds),
+                [total_cost] * len(seeds),
+                seeds,
+            )
+            candidates = np.vstack([candidates] + chosen)
+
+        weights = sum(self._broadcast("weights", candidates))
+        if len(candidates) <= self.n_clusters:
+            return np.vstack(
+                [candidates] + [candidates[:1]] * (self.n_clusters - len(candidates))
+            )
+        model = KMeans(self.n_clusters, n_init=1, random_state=rng.randint(2**31))
+        return model.fit(candidates, sample_weight=weights).cluster_centers_
+
+    def _fit(self, X, rng):
+        if isinstance(X, (list, tuple)) and all(isinstance(x, str) for x in X):
+            shards = list(X)
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            shards = np.array_split(X, len(self._connections))
+        if len(shards) != len(self._connections):
+            raise ValueError(
+                "got %d shards for %d workers" % (len(shards), len(self._connections))
+            )
+        self._sizes = self._map("load", shards)
+
+        # sklearn scales tol by the mean variance of the features
+        counts, sums, squares = zip(*self._broadcast("stats"))
+        n = sum(counts)
+        mean = sum(sums) / n
+        tol = self.tol * np.mean(sum(squares) / n - mean**2)
+
+        centers = self.init_centers_ = self._init_centers(rng)
+        n_iter = 0
+        for n_iter in range(1, self.max_iter + 1):
+            sums, counts, _ = zip(*self._broadcast("step", centers))
+            sums, counts = sum(sums), sum(counts)
+            # An empty cluster keeps its previous centre
+            updated = np.where(
+                counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers
+            )
+            shift = ((updated - centers) ** 2).sum()
+            centers = updated
+            if shift <= tol:
+                break
+
+        labels, inertias = zip(*self._broadcast("assign", centers))
+        self.cluster_centers_ = centers
+        self.labels_ = np.concatenate(labels)
+        self.inertia_ = float(sum(inertias))
+        self.n_iter_ = n_iter
+        self.n_features_in_ = centers.shape[1]
+
+    def fit(self, X, y=None):
+        rng = np.random.RandomState(self.random_state)
+        authkey = self.authkey or os.urandom(16)
+        processes, addresses = [], self.addresses
+        if addresses is None:
+            processes, addresses = start_local_workers(self.n_workers, authkey)
+        self._connections = [Client(address, authkey=authkey) for address in addresses]
+        try:
+            self._fit(X, rng)
+        finally:
+            for conn in self._connections:
+                if processes:
+                    conn.send(("shutdown",))
+                conn.close()
+            for process in processes:
+                process.join()
+            del self._connections
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        distances = (
+            (X**2).sum(axis=1)[:, None]
+            - 2 * X @ self.cluster_centers_.T
+            + (self.cluster_centers_**2).sum(axis=1)[None, :]
+        )
+        return np.sqrt(np.maximum(distances, 0))
+
+    def predict(self, X):
+        return np.argmin(self.transform(X), axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a DistributedKMeans worker. The authkey is read from "
+        "the DISTRIBUTED_KMEANS_AUTHKEY environment variable."
+    )
+    parser.add_argument("command", choices=["serve"])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6000)
+    parser.add_argument("--threads", type=int)
+    args = parser.parse_args()
+    serve(
+        (args.host, args.port),
+        os.environ["DISTRIBUTED_KMEANS_AUTHKEY"].encode(),
+        threads=args.threads,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Cluster evaluation from contingency tables built with np.bincount.
+
+script.py compares cluster labels with known classes by building a DataFrame
+and calling pd.crosstab. Here labels are integer-coded and the contingency
+table is a single np.bincount, which can also be accumulated chunk by chunk
+over streamed label arrays. ARI, NMI, homogeneity, completeness, V-measure
+and purity are all computed from the table alone, with no DataFrame.
+"""
+
+import numpy as np
+
+
+class Codebook:
+    """Stable integer codes for labels seen across several chunks."""
+
+    def __init__(self):
+        self.index = {}
+        self.direct = None
+        self.size = 0
+
+    def encode(self, values):
+        values = np.asarray(values)
+        # Small non-negative integers are their own codes, which skips the
+        # sort. The table is sized by the largest label, so labels much
+        # larger than the number of rows (years, IDs) go through np.unique
+        direct = values.dtype.kind in "iu" and (
+            not values.size
+            or (
+                values.min() >= 0
+                and values.max() < max(self.size, 2 * values.size, 1024)
+            )
+        )
+        if self.direct is None:
+            self.direct = direct
+        if self.direct and not direct:
+            # Keep the codes handed out so far: label i stays code i
+            self.index = {code: code for code in range(self.size)}
+            self.direct = False
+        if self.direct:
+            if values.size:
+                self.size = max(self.size, int(values.max()) + 1)
+            return values.astype(np.int64), None
+        uniques, inverse = np.unique(values, return_inverse=True)
+        codes = np.array(
+            [
+                self.index.setdefault(label, len(self.index))
+                for label in uniques.tolist()
+            ],
+            dtype=np.int64,
+        )
+        return codes[inverse.ravel()], self.classes()
+
+    def classes(self):
+        classes = np.empty(len(self.index), dtype=object)
+        for label, code in self.index.items():
+            classes[code] = label
+        return classes
+
+
+class ContingencyAccumulator:
+    """Contingency table of true classes (rows) by cluster labels (columns)."""
+
+    def __init__(self):
+        self.table = np.zeros((0, 0), dtype=np.int64)
+        self._rows = Codebook()
+        self._columns = Codebook()
+        self._row_classes = None
+        self._column_classes = None
+
+    def update(self, true_labels, predicted_labels):
+        rows, row_classes = self._rows.encode(true_labels)
+        columns, column_classes = self._columns.encode(predicted_labels)
+        if len(rows) != len(columns):
+            raise ValueError(
+                "label arrays differ in length: %d and %d" % (len(rows), len(columns))
+            )
+        if row_classes is not None:
+            self._row_classes = row_classes
+        if column_classes is not None:
+            self._column_classes = column_classes
+
+        n_rows = max(self.table.shape[0], rows.max() + 1 if len(rows) else 0)
+        n_columns = max(self.table.shape[1], columns.max() + 1 if len(columns) else 0)
+        counts = np.bincount(rows * n_columns + columns, minlength=n_rows * n_columns)
+        if (n_rows, n_columns) != self.table.shape:
+            grown = np.zeros((n_rows, n_columns), dtype=np.int64)
+            grown[: self.table.shape[0], : self.table.shape[1]] = self.table
+            self.table = grown
+        self.table += counts.reshape(n_rows, n_columns)
+        return self
+
+    def crosstab(self):
+        """Return (table, row_classes, column_classes) without empty rows or columns."""
+        keep_rows = self.table.sum(axis=1) > 0
+        keep_columns = self.table.sum(axis=0) > 0
+        row_classes = self._row_classes
+        if row_classes is None:
+            row_classes = np.arange(self.table.shape[0])
+        column_classes = self._column_classes
+        if column_classes is None:
+            column_classes = np.arange(self.table.shape[1])
+        return (
+            self.table[keep_rows][:, keep_columns],
+            row_classes[keep_rows],
+            column_classes[keep_columns],
+        )
+
+    def scores(self):
+        return scores(self.table)
+
+
+def contingency(true_labels, predicted_labels):
+    """Return the contingency table of two label arrays."""
+    return ContingencyAccumulator().update(true_labels, predicted_labels).crosstab()
+
+
+def _pairs(counts):
+    counts = counts.astype(np.float64)
+    return (counts * (counts - 1) / 2).sum()
+
+
+def _entropy(counts, total):
+    p = counts[counts > 0] / total
+    return -(p * np.log(p)).sum()
+
+
+def scores(table):
+    """Return ARI, NMI, homogeneity, completeness, V-measure and purity."""
+    table = np.asarray(table, dtype=np.int64)
+    n = table.sum()
+    rows, columns = table.sum(axis=1), table.sum(axis=0)
+
+    # Adjusted Rand index from pair counts
+    index = _pairs(table)
+    expected = _pairs(rows) * _pairs(columns) / (n * (n - 1) / 2) if n > 1 else 0.0
+    maximum = (_pairs(rows) + _pairs(columns)) / 2
+    ari = 1.0 if maximum == expected else (index - expected) / (maximum - expected)
+
+    # Mutual information and the entropies of both labelings
+    nonzero = table > 0
+    joint = table[nonzero] / n
+    outer = np.outer(rows, columns)[nonzero] / n**2
+    mutual = (joint * np.log(joint / outer)).sum()
+    h_true, h_pred = _entropy(rows, n), _entropy(columns, n)
+
+    homogeneity = 1.0 if h_true == 0 else mutual / h_true
+    completeness = 1.0 if h_pred == 0 else mutual / h_pred
+    v_measure = (
+        0.0
+        if homogeneity + completeness == 0
+        else 2 * homogeneity * completeness / (homogeneity + completeness)
+    )
+    # Arithmetic normalization, as in sklearn's default
+    nmi = 1.0 if h_true == h_pred == 0 else mutual / max((h_true + h_pred) / 2, 1e-300)
+    return {
+        "ari": float(ari),
+        "nmi": float(nmi),
+        "homogeneity": float(homogeneity),
+        "completeness": float(completeness),
+        "v_measure": float(v_measure),
+        "purity": float(table.max(axis=0).sum() / n),
+    }
+
+
+def evaluate(true_labels, predicted_labels, chunksize=None):
+    """Return the scores of predicted_labels against true_labels.
+
+    With chunksize the table is accumulated over slices of the inputs, which
+    may be memory-mapped arrays.
+    """
+    accumulator = ContingencyAccumulator()
+    if chunksize is None:
+        accumulator.update(true_labels, predicted_labels)
+    else:
+        for start in range(0, len(true_labels), chunksize):
+            accumulator.update(
+                true_labels[start : start + chunksize],
+                predicted_labels[start : start + chunksize],
+            )
+    return accumulator.scores()
@@ -0,0 +1,99 @@
+"""Drop-in KMeans with bound pruning, float32 data and parallel restarts.
+
+The KMeans fits in script.py run Lloyd iterations on float64 with the n_init
+restarts one after another. FastKMeans runs each restart with Elkan's
+triangle-inequality bounds, which skip most point-to-centroid distance
+computations once the centroids settle. It casts the samples to float32 by
+default, halving memory traffic, and spreads the restarts over worker
+processes. The best restart's cluster_centers_, labels_ and inertia_ are
+exposed exactly as KMeans exposes them.
+"""
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClusterMixin, TransformerMixin
+from sklearn.cluster import KMeans
+from threadpoolctl import threadpool_limits
+
+
+def _restart(X, params, seed, threads):
+    with threadpool_limits(limits=threads):
+        return KMeans(n_init=1, random_state=seed, **params).fit(X)
+
+
+class FastKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
+    """KMeans with Elkan pruning, a float32 path and parallel n_init restarts.
+
+    Sparse input falls back to Lloyd iterations, which Elkan does not support
+    for sparse matrices. By default the restarts run in parallel on every
+    core; n_jobs=1 runs them in-process, each one using every core for its
+    own distance computations.
+    """
+
+    def __init__(
+        self,
+        n_clusters=8,
+        n_init=10,
+        max_iter=300,
+        tol=1e-4,
+        algorithm="elkan",
+        dtype=np.float32,
+        n_jobs=-1,
+        random_state=None,
+    ):
+        self.n_clusters = n_clusters
+        self.n_init = n_init
+        self.max_iter = max_iter
+        self.tol = tol
+        self.algorithm = algorithm
+        self.dtype = dtype
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _cast(self, X):
+        if sparse.issparse(X):
+            return X.astype(self.dtype)
+        return np.ascontiguousarray(X, dtype=self.dtype)
+
+    def fit(self, X, y=None):
+        X = self._cast(X)
+        algorithm = "lloyd" if sparse.issparse(X) else self.algorithm
+        params = {
+            "n_clusters": self.n_clusters,
+            "max_iter": self.max_iter,
+            "tol": self.tol,
+            "algorithm": algorithm,
+        }
+        seeds = np.random.RandomState(self.random_state).randint(
+            np.iinfo(np.int32).max, size=self.n_init
+        )
+
+        # Small inputs are not worth shipping to worker processes
+        n_jobs = self.n_jobs
+        if effective_n_jobs(n_jobs) == 1 or X.shape[0] * X.shape[1] < 100000:
+            n_jobs = 1
+
+        # One BLAS/OpenMP thread per restart when restarts run side by side
+        threads = None if n_jobs == 1 else 1
+        models = Parallel(n_jobs=n_jobs)(
+            delayed(_restart)(X, params, seed, threads) for seed in seeds
+        )
+        best = min(models, key=lambda model: model.inertia_)
+
+        self.model_ = best
+        self.cluster_centers_ = best.cluster_centers_
+        self.labels_ = best.labels_
+        self.inertia_ = best.inertia_
+        self.n_iter_ = best.n_iter_
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def predict(self, X):
+        return self.model_.predict(self._cast(X))
+
+    def transform(self, X):
+        return self.model_.transform(self._cast(X))
+
+    def score(self, X, y=None):
+        return self.model_.score(self._cast(X))
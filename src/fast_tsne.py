@@ -0,0 +1,74 @@
+"""t-SNE on a cached sparse nearest-neighbour graph.
+
+TSNE(learning_rate=...) in script.py recomputes the neighbourhoods behind its
+perplexity-calibrated affinities on every run. embed builds the k-nearest-
+neighbour graph once, with 3 * perplexity + 1 neighbours as sklearn's
+Barnes-Hut solver needs, and caches it on disk keyed by the data and the
+perplexity. The embedding then runs Barnes-Hut gradient descent on the
+precomputed sparse graph across all threads, so re-running with a new
+learning rate, or resuming from an earlier embedding, skips the neighbour
+search entirely.
+"""
+
+import os
+
+import numpy as np
+from scipy.sparse import load_npz, save_npz
+from sklearn.manifold import TSNE
+from sklearn.neighbors import NearestNeighbors
+
+from cache import array_digest, cache_path
+
+
+def knn_graph(samples, perplexity=30.0, n_jobs=-1, cache=True, cache_dir=None):
+    """Return the sparse graph of squared distances to the nearest neighbours."""
+    samples = np.asarray(samples, dtype=np.float64)
+    # TSNE asks the precomputed graph for one neighbour more than it uses
+    n_neighbors = min(samples.shape[0] - 1, int(3.0 * perplexity + 1) + 1)
+
+    entry = None
+    if cache:
+        key = array_digest(samples, np.array([n_neighbors]))
+        entry = cache_path("knn", key, ".npz", cache_dir)
+        if os.path.exists(entry):
+            return load_npz(entry)
+
+    neighbors = NearestNeighbors(n_neighbors=n_neighbors, n_jobs=n_jobs).fit(samples)
+    graph = neighbors.kneighbors_graph(mode="distance")
+    # sklearn squares Euclidean distances itself, but not precomputed ones
+    graph.data **= 2
+
+    if entry is not None:
+        tmp = entry + ".tmp.npz"
+        save_npz(tmp, graph, compressed=False)
+        os.replace(tmp, entry)
+    return graph
+
+
+def embed(
+    samples,
+    perplexity=30.0,
+    learning_rate=200.0,
+    init=None,
+    n_jobs=-1,
+    random_state=None,
+    cache=True,
+    **tsne_params
+):
+    """Return a 2-d t-SNE embedding of samples.
+
+    Pass a previous embedding as init to resume from it rather than from a
+    random layout; extra keyword arguments are forwarded to TSNE.
+    """
+    graph = knn_graph(samples, perplexity, n_jobs=n_jobs, cache=cache)
+    model = TSNE(
+        perplexity=perplexity,
+        learning_rate=learning_rate,
+        metric="precomputed",
+        method="barnes_hut",
+        init="random" if init is None else np.asarray(init, dtype=np.float32),
+        n_jobs=n_jobs,
+        random_state=random_state,
+        **tsne_params
+    )
+    return model.fit_transform(graph)
@@ -0,0 +1,154 @@
+"""Single-pass TF-IDF over a stream of documents with feature hashing.
+
+TfidfVectorizer in script.py builds an in-memory vocabulary before it can
+weight anything. StreamingTfidf hashes terms into a fixed number of columns
+with HashingVectorizer instead, so vocabulary memory is constant, and keeps
+running document frequencies as blocks of documents arrive. The raw term
+counts of each block are kept as CSR (optionally spilled to disk), so IDF
+weighting is applied after the single pass over the text without reading it
+again. Blocks can be vectorized in worker processes, since hashing needs no
+shared state. The weighted CSR blocks feed the TruncatedSVD -> KMeans
+pipeline directly.
+"""
+
+import os
+from collections import deque
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+from scipy.sparse import diags, load_npz, save_npz, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+def iter_lyrics(path="contestants.csv", chunksize=500):
+    """Yield the non-empty lyrics of contestants.csv one at a time."""
+    for chunk in pd.read_csv(path, usecols=["lyrics"], chunksize=chunksize):
+        for lyrics in chunk["lyrics"].dropna():
+            yield lyrics
+
+
+def _batches(documents, block_size):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) == block_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _count(task):
+    # Module-level so that worker processes can unpickle it
+    vectorizer, documents = task
+    return vectorizer.transform(documents)
+
+
+class StreamingTfidf:
+    """Hashed TF-IDF fitted in one pass over a document generator.
+
+    The weighting matches TfidfVectorizer with smooth_idf and l2 norm, up to
+    hash collisions between terms.
+    """
+
+    def __init__(
+        self,
+        n_features=2**20,
+        block_size=1000,
+        n_jobs=1,
+        sublinear_tf=False,
+        spill_dir=None,
+        **hashing_params
+    ):
+        self.n_features = n_features
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+        self.sublinear_tf = sublinear_tf
+        self.spill_dir = spill_dir
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None, **hashing_params
+        )
+        self._reset()
+
+    def _reset(self):
+        # Blocks spilled by a previous fit are not read again
+        for block in getattr(self, "_blocks", ()):
+            if isinstance(block, str) and os.path.exists(block):
+                os.remove(block)
+        self.document_frequency = np.zeros(self.n_features, dtype=np.int64)
+        self.n_documents = 0
+        self._blocks = []
+
+    def _add(self, counts):
+        # Each stored column index is one document containing that term
+        counts.sum_duplicates()
+        self.document_frequency += np.bincount(
+            counts.indices, minlength=self.n_features
+        )
+        self.n_documents += counts.shape[0]
+        if self.spill_dir is None:
+            self._blocks.append(counts)
+        else:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, "block-%06d.npz" % len(self._blocks))
+            save_npz(path, counts, compressed=False)
+            self._blocks.append(path)
+
+    def partial_fit(self, documents):
+        """Count a batch of documents and update the document frequencies."""
+        self._add(self.vectorizer.transform(documents))
+        return self
+
+    def fit(self, documents):
+        """Consume an iterable of documents in blocks of block_size.
+
+        Starts from scratch; use partial_fit to add to the fitted counts.
+        """
+        self._reset()
+        tasks = (
+            (self.vectorizer, batch) for batch in _batches(documents, self.block_size)
+        )
+        workers = effective_n_jobs(self.n_jobs)
+        if workers == 1:
+            for task in tasks:
+                self._add(_count(task))
+        else:
+            # Pool.imap would drain the generator up front, so keep only a
+            # few batches in flight and take the results in order
+            pending = deque()
+            with Pool(workers) as pool:
+                for task in tasks:
+                    pending.append(pool.apply_async(_count, (task,)))
+                    if len(pending) >= 2 * workers:
+                        self._add(pending.popleft().get())
+                while pending:
+                    self._add(pending.popleft().get())
+        return self
+
+    @property
+    def idf_(self):
+        return np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+
+    def _weight(self, counts, idf):
+        counts = counts.astype(np.float64)
+        if self.sublinear_tf:
+            np.log(counts.data, out=counts.data)
+            counts.data += 1
+        return normalize(counts @ diags(idf))
+
+    def iter_blocks(self):
+        """Yield the TF-IDF weighted CSR block of every fitted batch."""
+        idf = self.idf_
+        for block in self._blocks:
+            counts = load_npz(block) if isinstance(block, str) else block
+            yield self._weight(counts, idf)
+
+    def fit_transform(self, documents):
+        return vstack(list(self.fit(documents).iter_blocks()), format="csr")
+
+    def transform(self, documents):
+        """Weight new documents with the document frequencies fitted so far."""
+        return self._weight(self.vectorizer.transform(documents), self.idf_)
@@ -0,0 +1,360 @@
+"""Hierarchical clustering without the O(n^2) condensed distance matrix.
+
+scipy.cluster.hierarchy.linkage allocates every pairwise distance up front,
+which stops working at a few tens of thousands of rows. This engine keeps
+memory linear in the number of samples:
+
+* single linkage is computed from a minimum spanning tree built with Prim's
+  algorithm, one row of distances at a time;
+* complete, average and ward linkage use the nearest-neighbour-chain
+  algorithm. Cluster-to-cluster distance rows are computed on demand in
+  blocks and kept in a bounded LRU cache that is updated with the
+  Lance-Williams formulas as clusters merge.
+
+The result is a scipy-compatible linkage matrix, so dendrogram and fcluster
+work on it unchanged. Inputs whose condensed matrix fits within memory_limit
+are handed to scipy directly. cut_sweep turns one linkage matrix into flat
+clusterings at many heights or cluster counts at once.
+"""
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.cluster import hierarchy
+from scipy.spatial.distance import cdist
+
+METHODS = ("single", "complete", "average", "ward")
+
+Cuts = namedtuple("Cuts", ["labels", "n_clusters"])
+
+
+def _lance_williams(method, d_xa, d_xb, d_ab, n_x, n_a, n_b):
+    # Distance from cluster x to the union of clusters a and b
+    if method == "complete":
+        return np.maximum(d_xa, d_xb)
+    if method == "average":
+        return (n_a * d_xa + n_b * d_xb) / (n_a + n_b)
+    total = n_x + n_a + n_b
+    return np.sqrt(
+        np.maximum(
+            ((n_x + n_a) * d_xa**2 + (n_x + n_b) * d_xb**2 - n_x * d_ab**2) / total,
+            0,
+        )
+    )
+
+
+def _label(n, merges):
+    """Turn (point, point, distance) merges into a sorted scipy linkage."""
+    merges = merges[np.argsort(merges[:, 2], kind="mergesort")]
+    parent = np.arange(n)
+    cluster = np.arange(n)
+    size = np.ones(n, dtype=np.int64)
+
+    def find(i):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    linkage_matrix = np.empty((n - 1, 4))
+    for i, (a, b, distance) in enumerate(merges):
+        root_a, root_b = find(int(a)), find(int(b))
+        id_a, id_b = cluster[root_a], cluster[root_b]
+        linkage_matrix[i] = (
+            min(id_a, id_b),
+            max(id_a, id_b),
+            distance,
+            size[root_a] + size[root_b],
+        )
+        # Union by size, the surviving root takes the new cluster id
+        if size[root_a] < size[root_b]:
+            root_a, root_b = root_b, root_a
+        parent[root_b] = root_a
+        size[root_a] += size[root_b]
+        cluster[root_a] = n + i
+    return linkage_matrix
+
+
+def _single(samples):
+    """Prim's minimum spanning tree, one distance row per added point."""
+    n = samples.shape[0]
+    # Points outside the tree, compacted by swapping removed points to the end
+    remaining = samples.copy()
+    index = np.arange(n)
+    nearest = np.full(n, np.inf)
+    parent = np.zeros(n, dtype=np.int64)
+    merges = np.empty((n - 1, 3))
+
+    current, size = 0, n
+    for i in range(n - 1):
+        added = index[current]
+        point = remaining[current].copy()
+        size -= 1
+        for values in (remaining, index, nearest, parent):
+            values[current] = values[size]
+
+        difference = remaining[:size] - point
+        distances = np.sqrt(np.einsum("ij,ij->i", difference, difference))
+        closer = distances < nearest[:size]
+        nearest[:size][closer] = distances[closer]
+        parent[:size][closer] = added
+
+        current = int(np.argmin(nearest[:size]))
+        merges[i] = (parent[current], index[current], nearest[current])
+    return merges
+
+
+class _ClusterDistances:
+    """Distance rows between active clusters, computed in blocks on demand."""
+
+    def __init__(self, samples, method, max_rows, block_rows):
+        n = samples.shape[0]
+        self.samples = samples
+        self.method = method
+        self.max_rows = max_rows
+        self.block_rows = block_rows
+        self.active = np.ones(n, dtype=bool)
+        self.size = np.ones(n, dtype=np.int64)
+        # Cached rows live in a fixed table, indexed through an LRU map
+        self.table = np.empty((max_rows, n))
+        self.rows = OrderedDict()
+        self.free = list(range(max_rows))
+        if method == "ward":
+            self.centroids = samples.astype(np.float64, copy=True)
+        else:
+            # Members of each cluster as a linked list headed by its slot
+            self.next_member = np.full(n, -1, dtype=np.int64)
+            self.last_member = np.arange(n)
+            self.slot_of = np.arange(n)
+
+    def _members(self, slot):
+        members = [slot]
+        while self.next_member[members[-1]] >= 0:
+            members.append(self.next_member[members[-1]])
+        return np.array(members)
+
+    def _compute(self, slot):
+        n = self.samples.shape[0]
+        if self.method == "ward":
+            sizes = self.size * self.size[slot] / (self.size + self.size[slot])
+            distances = np.sqrt(
+                2 * sizes * ((self.centroids - self.centroids[slot]) ** 2).sum(axis=1)
+            )
+        else:
+            # Reduce point-to-point distances over the members of the cluster,
+            # a block of members at a time, then over the members of every
+            # other cluster
+            members = self._members(slot)
+            per_point = np.zeros(n)
+            for start in range(0, len(members), self.block_rows):
+                block = cdist(
+                    self.samples[members[start : start + self.block_rows]], self.samples
+                )
+                if self.method == "complete":
+                    np.maximum(per_point, block.max(axis=0), out=per_point)
+                else:
+                    per_point += block.sum(axis=0)
+            distances = np.zeros(n)
+            if self.method == "complete":
+                np.maximum.at(distances, self.slot_of, per_point)
+            else:
+                np.add.at(distances, self.slot_of, per_point)
+                distances /= np.maximum(self.size * len(members), 1)
+        distances[~self.active] = np.inf
+        distances[slot] = np.inf
+        return distances
+
+    def row(self, slot):
+        if slot in self.rows:
+            self.rows.move_to_end(slot)
+            return self.table[self.rows[slot]]
+        if self.free:
+            position = self.free.pop()
+        else:
+            _, position = self.rows.popitem(last=False)
+        self.table[position] = self._compute(slot)
+        self.rows[slot] = position
+        return self.table[position]
+
+    def merge(self, a, b, distance):
+        """Merge the cluster in slot b into slot a."""
+        n_a, n_b = self.size[a], self.size[b]
+        position_a = self.rows.pop(a, None)
+        position_b = self.rows.pop(b, None)
+
+        # Keep every cached row consistent with the merge
+        if self.rows:
+            slots = np.fromiter(self.rows.keys(), dtype=np.int64)
+            positions = np.fromiter(self.rows.values(), dtype=np.int64)
+            self.table[positions, a] = _lance_williams(
+                self.method,
+                self.table[positions, a],
+                self.table[positions, b],
+                distance,
+                self.size[slots],
+                n_a,
+                n_b,
+            )
+            self.table[positions, b] = np.inf
+
+        self.active[b] = False
+        self.size[a] = n_a + n_b
+        if self.method == "ward":
+            self.centroids[a] = (n_a * self.centroids[a] + n_b * self.centroids[b]) / (
+                n_a + n_b
+            )
+        else:
+            members_b = self._members(b)
+            self.slot_of[members_b] = a
+            self.next_member[self.last_member[a]] = b
+            self.last_member[a] = self.last_member[b]
+
+        if position_a is not None and position_b is not None:
+            # The merged row follows from the two rows it replaces
+            row = _lance_williams(
+                self.method,
+                self.table[position_a],
+                self.table[position_b],
+                distance,
+                self.size,
+                n_a,
+                n_b,
+            )
+            row[~self.active] = np.inf
+            row[a] = np.inf
+            self.table[position_a] = row
+            self.rows[a] = position_a
+            self.free.append(position_b)
+        else:
+            self.free.extend(p for p in (position_a, position_b) if p is not None)
+
+
+def _nn_chain(samples, method, max_rows, block_rows):
+    n = samples.shape[0]
+    distances = _ClusterDistances(samples, method, max_rows, block_rows)
+    merges = np.empty((n - 1, 3))
+    chain = []
+    first = 0
+
+    for i in range(n - 1):
+        if not chain:
+            while not distances.active[first]:
+                first += 1
+            chain.append(first)
+
+        # Follow nearest neighbours until two clusters are mutually nearest
+        while True:
+            x = chain[-1]
+            row = distances.row(x)
+            y = int(np.argmin(row))
+            if len(chain) > 1 and row[chain[-2]] <= row[y]:
+                y = chain[-2]
+                break
+            chain.append(y)
+
+        distance = row[y]
+        chain = chain[:-2]
+        a, b = (x, y) if distances.size[x] >= distances.size[y] else (y, x)
+        distances.merge(a, b, distance)
+        merges[i] = (a, b, distance)
+    return merges
+
+
+def linkage(samples, method="single", memory_limit=256 * 2**20):
+    """Return a scipy-compatible linkage matrix for the rows of samples.
+
+    memory_limit bounds, in bytes, both the condensed distance matrix that
+    may be handed to scipy and the cached distance rows of the chain
+    algorithm. Distances are Euclidean.
+    """
+    if method not in METHODS:
+        raise ValueError("method must be one of %s, got %r" % (METHODS, method))
+    samples = np.asarray(samples, dtype=np.float64)
+    n = samples.shape[0]
+    if n < 2:
+        raise ValueError("at least two samples are needed, got %d" % n)
+
+    if n * (n - 1) // 2 * 8 <= memory_limit:
+        return hierarchy.linkage(samples, method=method)
+
+    if method == "single":
+        merges = _single(samples)
+    else:
+        row_bytes = 8 * n
+        max_rows = max(4, memory_limit // row_bytes)
+        block_rows = max(1, memory_limit // 4 // row_bytes)
+        merges = _nn_chain(samples, method, max_rows, block_rows)
+    return _label(n, merges)
+
+
+def _leaf_positions(linkage_matrix):
+    """Place leaves so that every cluster of the tree is a contiguous range.
+
+    Returns the position of each leaf and, for each of the n - 1 gaps between
+    neighbouring positions, the index of the merge that closes it.
+    """
+    n = linkage_matrix.shape[0] + 1
+    children = linkage_matrix[:, :2].astype(np.int64).tolist()
+    sizes = [1] * n + linkage_matrix[:, 3].astype(np.int64).tolist()
+    start = [0] * (2 * n - 1)
+    closed_by = np.empty(n - 1, dtype=np.int64)
+    # Children have smaller ids than their parent, so walk from the root down
+    for i in range(n - 2, -1, -1):
+        left, right = children[i]
+        start[left] = start[n + i]
+        start[right] = start[n + i] + sizes[left]
+        closed_by[start[right] - 1] = i
+    return np.array(start[:n]), closed_by
+
+
+def _cut_block(positions, closed_by, n_merges, out):
+    # A new cluster begins at every gap not yet closed after n_merges merges
+    opens = closed_by[None, :] >= n_merges[:, None]
+    in_order = np.empty((len(n_merges), len(positions)), dtype=out.dtype)
+    in_order[:, 0] = 1
+    np.cumsum(opens, axis=1, out=in_order[:, 1:])
+    in_order[:, 1:] += 1
+    out[:] = in_order[:, positions]
+
+
+def cut_sweep(
+    linkage_matrix, thresholds=None, n_clusters=None, n_jobs=None, block_size=64
+):
+    """Return flat clusterings of linkage_matrix for many cuts in one pass.
+
+    Give either thresholds, matching fcluster(..., criterion="distance") at
+    each height, or n_clusters, matching cut_tree (fcluster's "maxclust" may
+    return fewer clusters when merge heights tie). The result is a Cuts tuple
+    of a (n_cuts, n_samples) label matrix, numbered from 1 like fcluster, and
+    the number of clusters at each cut. Labels agree with fcluster up to a
+    permutation of the cluster numbers. The linkage must be monotone, which
+    holds for every method in METHODS.
+    """
+    linkage_matrix = np.asarray(linkage_matrix, dtype=np.float64)
+    n = linkage_matrix.shape[0] + 1
+    heights = linkage_matrix[:, 2]
+    if np.any(np.diff(heights) < 0):
+        raise ValueError("cut_sweep needs a monotone linkage matrix")
+    if (thresholds is None) == (n_clusters is None):
+        raise ValueError("give exactly one of thresholds and n_clusters")
+
+    if thresholds is not None:
+        n_merges = np.searchsorted(heights, np.atleast_1d(thresholds), side="right")
+    else:
+        n_merges = n - np.clip(np.atleast_1d(n_clusters).astype(np.int64), 1, n)
+
+    positions, closed_by = _leaf_positions(linkage_matrix)
+    labels = np.empty((len(n_merges), n), dtype=np.int16 if n < 2**15 else np.int32)
+    Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_cut_block)(
+            positions,
+            closed_by,
+            n_merges[start : start + block_size],
+            labels[start : start + block_size],
+        )
+        for start in range(0, len(n_merges), block_size)
+    )
+    return Cuts(labels, n - n_merges)
@@ -0,0 +1,259 @@
+"""Lightweight timing, memory and profiling hooks for the analysis stages.
+
+A Recorder collects one record per stage run: wall time, CPU time, peak
+traced memory and the shape of the stage's input. Stages are marked with the
+stage() context manager, by wrapping a loader function with wrap(), or by
+instrumenting a pipeline so that every step's fit/transform/predict call is
+recorded. Functions decorated with section() become stages of whichever
+Recorder is active; sections.py uses this, so cli.py and dag.py record the
+sections of script.py with --record. Records can be written as JSON lines or rendered in the Prometheus
+text exposition format. Stages listed in profile_stages are also sampled by
+a background thread, which collects collapsed stacks suitable for flame
+graphs.
+"""
+
+import functools
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+METHODS = ("fit", "partial_fit", "transform", "fit_transform", "predict", "fit_predict")
+
+# The Recorder that section() functions report to, if any
+_active = None
+
+
+def _shape(data):
+    if data is None or isinstance(data, (str, bytes)):
+        return None
+    if hasattr(data, "shape"):
+        return list(data.shape)
+    try:
+        return [len(data)]
+    except TypeError:
+        return None
+
+
+class SamplingProfiler:
+    """Sample the stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    "%s:%s" % (code.co_filename.rsplit("/", 1)[-1], code.co_name)
+                )
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+class Recorder:
+    """Collects per-stage wall time, CPU time, peak memory and input shape."""
+
+    def __init__(self, trace_memory=True, profile_stages=(), profile_interval=0.005):
+        self.trace_memory = trace_memory
+        self.profile_stages = set(profile_stages)
+        self.profile_interval = profile_interval
+        self.records = []
+        self.profiles = {}
+        # Highest absolute traced memory seen by each open stage, since a
+        # nested stage resets the tracemalloc peak
+        self._open = []
+
+    @contextmanager
+    def stage(self, name, data=None):
+        """Record the block of code inside the with statement as one stage."""
+        started_tracing = False
+        baseline = 0
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            if self._open:
+                self._open[-1] = max(self._open[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        self._open.append(baseline)
+
+        profiler = None
+        if name in self.profile_stages:
+            profiler = SamplingProfiler(interval=self.profile_interval).start()
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            highest = self._open.pop()
+            peak = None
+            if self.trace_memory:
+                highest = max(highest, tracemalloc.get_traced_memory()[1])
+                peak = highest - baseline
+                if self._open:
+                    self._open[-1] = max(self._open[-1], highest)
+                if started_tracing:
+                    tracemalloc.stop()
+            if profiler is not None:
+                self.profiles.setdefault(name, Counter()).update(profiler.stop())
+
+            self.records.append(
+                {
+                    "stage": name,
+                    "depth": len(self._open),
+                    "wall_seconds": wall,
+                    "cpu_seconds": cpu,
+                    "peak_memory_bytes": peak,
+                    "input_shape": _shape(data),
+                    "timestamp": time.time(),
+                }
+            )
+
+    def wrap(self, func, name=None):
+        """Return func recorded as a stage, with its first argument as input."""
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.stage(name, args[0] if args else None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def instrument(self, estimator, name=None):
+        """Record the fit/transform/predict calls of an estimator in place.
+
+        For a pipeline every step is instrumented as "<step>.<method>". The
+        wrappers live on the instances; call uninstrument before pickling.
+        """
+        if hasattr(estimator, "steps"):
+            for step_name, step in estimator.steps:
+                if step is not None and step != "passthrough":
+                    self.instrument(step, step_name)
+            return estimator
+        name = name or type(estimator).__name__.lower()
+        for method in METHODS:
+            if hasattr(estimator, method):
+                bound = getattr(type(estimator), method).__get__(estimator)
+                setattr(estimator, method, self.wrap(bound, "%s.%s" % (name, method)))
+        return estimator
+
+    def write_jsonl(self, path):
+        """Append every record to path as one JSON object per line."""
+        with open(path, "a") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+    def prometheus(self):
+        """Return totals per stage in the Prometheus text format."""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(
+                record["stage"], {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak": 0}
+            )
+            total["calls"] += 1
+            total["wall"] += record["wall_seconds"]
+            total["cpu"] += record["cpu_seconds"]
+            total["peak"] = max(total["peak"], record["peak_memory_bytes"] or 0)
+
+        metrics = [
+            ("stage_calls_total", "counter", "Number of runs of the stage", "calls"),
+            (
+                "stage_wall_seconds_total",
+                "counter",
+                "Wall time spent in the stage",
+                "wall",
+            ),
+            (
+                "stage_cpu_seconds_total",
+                "counter",
+                "CPU time spent in the stage",
+                "cpu",
+            ),
+            (
+                "stage_peak_memory_bytes",
+                "gauge",
+                "Largest traced peak of one run",
+                "peak",
+            ),
+        ]
+        lines = []
+        for metric, kind, help_text, field in metrics:
+            lines.append("# HELP %s %s" % (metric, help_text))
+            lines.append("# TYPE %s %s" % (metric, kind))
+            for stage, total in totals.items():
+                label = stage.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append('%s{stage="%s"} %s' % (metric, label, total[field]))
+        return "\n".join(lines) + "\n"
+
+    def write_profile(self, name, path):
+        """Write the sampled stacks of a profiled stage in collapsed format."""
+        with open(path, "w") as f:
+            for stack, count in self.profiles.get(name, Counter()).most_common():
+                f.write("%s %d\n" % (stack, count))
+
+
+def uninstrument(estimator):
+    """Remove the wrappers added by Recorder.instrument."""
+    steps = (
+        [step for _, step in estimator.steps]
+        if hasattr(estimator, "steps")
+        else [estimator]
+    )
+    for step in steps:
+        for method in METHODS:
+            if hasattr(step, "__dict__"):
+                step.__dict__.pop(method, None)
+    return estimator
+
+
+def activate(recorder):
+    """Make section() functions record into recorder; return the previous one.
+
+    Pass None to stop recording.
+    """
+    global _active
+    previous, _active = _active, recorder
+    return previous
+
+
+def section(func):
+    """Record every call of func as a stage of the active Recorder.
+
+    The stage is named after func and its input is the first argument.
+    Without an active Recorder the call costs one attribute lookup.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return func(*args, **kwargs)
+        with _active.stage(func.__name__, args[0] if args else None):
+            return func(*args, **kwargs)
+
+    return wrapper
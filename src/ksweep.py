@@ -0,0 +1,164 @@
+"""Parallel, warm-started KMeans sweep over a range of cluster counts.
+
+The elbow plot in script.py refits KMeans from scratch for every k. Here the
+k values are split into contiguous runs that are handed to a process pool.
+The samples are placed in shared memory once, so workers attach to them
+instead of receiving a pickled copy, and inside a run the solution for k
+seeds the fit for k + 1 with one extra k-means++ centre. That warm start is
+one of the n_init starts for k + 1, not the only one: a warm start alone
+gets stuck near the k solution and flattens the elbow.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import davies_bouldin_score, silhouette_score
+from threadpoolctl import threadpool_limits
+
+SweepResult = namedtuple(
+    "SweepResult", ["ks", "inertias", "silhouettes", "davies_bouldins"]
+)
+
+# Samples attached from shared memory in each worker process
+_shared = {}
+
+
+def _attach(name, shape, dtype, threads):
+    block = shared_memory.SharedMemory(name=name)
+    _shared["block"] = block
+    _shared["samples"] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    _shared["threads"] = threads
+
+
+def _squared_distances(samples, centers):
+    distances = (
+        (samples**2).sum(axis=1)[:, None]
+        - 2 * samples @ centers.T
+        + (centers**2).sum(axis=1)[None, :]
+    )
+    return np.maximum(distances, 0)
+
+
+def _next_centre(samples, centers, rng, sample_size):
+    # Greedy k-means++ step: draw a few D^2-weighted candidates and keep the
+    # one that lowers the potential the most
+    if samples.shape[0] > sample_size:
+        samples = samples[rng.choice(samples.shape[0], sample_size, replace=False)]
+    closest = _squared_distances(samples, centers).min(axis=1)
+    total = closest.sum()
+    if total == 0:
+        return samples[rng.randint(samples.shape[0])]
+    n_trials = 2 + int(np.log(len(centers) + 1))
+    candidates = samples[rng.choice(samples.shape[0], n_trials, p=closest / total)]
+    potentials = np.minimum(
+        closest[:, None], _squared_distances(samples, candidates)
+    ).sum(axis=0)
+    return candidates[np.argmin(potentials)]
+
+
+def _sweep_run(ks, options, samples=None):
+    if samples is None:
+        samples = _shared["samples"]
+    rng = np.random.RandomState(options["random_state"])
+    results = []
+    centers = None
+
+    with threadpool_limits(limits=options.get("threads") or _shared.get("threads")):
+        for k in ks:
+            model = None
+            if options["warm_start"] and centers is not None and len(centers) < k:
+                # Extend the previous solution with new centres
+                while len(centers) < k:
+                    centre = _next_centre(
+                        samples, centers, rng, options["init_sample_size"]
+                    )
+                    centers = np.vstack([centers, centre])
+                model = KMeans(n_clusters=k, init=centers, n_init=1).fit(samples)
+            n_cold = options["n_init"] - (model is not None)
+            if n_cold > 0:
+                cold = KMeans(n_clusters=k, n_init=n_cold, random_state=rng)
+                cold.fit(samples)
+                if model is None or cold.inertia_ < model.inertia_:
+                    model = cold
+            labels = model.labels_
+            centers = model.cluster_centers_
+
+            silhouette = davies_bouldin = np.nan
+            if 1 < k < samples.shape[0]:
+                if options["silhouette"]:
+                    silhouette = silhouette_score(
+                        samples,
+                        labels,
+                        sample_size=min(options["score_sample_size"], len(samples)),
+                        random_state=options["random_state"],
+                    )
+                if options["davies_bouldin"]:
+                    davies_bouldin = davies_bouldin_score(samples, labels)
+            results.append((k, model.inertia_, silhouette, davies_bouldin))
+    return results
+
+
+def _split(ks, n_runs):
+    # Contiguous runs of roughly equal total cost, with cost growing with k
+    costs = np.cumsum(ks)
+    bounds = np.searchsorted(costs, costs[-1] * np.arange(1, n_runs) / n_runs)
+    return [run for run in np.split(np.asarray(ks), bounds) if len(run)]
+
+
+def inertia_sweep(
+    samples,
+    ks,
+    n_jobs=None,
+    warm_start=True,
+    silhouette=False,
+    davies_bouldin=False,
+    n_init=10,
+    score_sample_size=10000,
+    init_sample_size=100000,
+    random_state=None,
+):
+    """Fit KMeans for every k in ks and return a SweepResult.
+
+    Silhouette scores are estimated on score_sample_size rows, since the exact
+    score is quadratic in the number of samples. Scores are NaN for k = 1.
+    """
+    samples = np.ascontiguousarray(samples)
+    ks = sorted(int(k) for k in ks)
+    n_jobs = os.cpu_count() if n_jobs is None else n_jobs
+    n_jobs = max(1, min(n_jobs, len(ks)))
+    options = {
+        "warm_start": warm_start,
+        "silhouette": silhouette,
+        "davies_bouldin": davies_bouldin,
+        "n_init": n_init,
+        "score_sample_size": score_sample_size,
+        "init_sample_size": init_sample_size,
+        "random_state": random_state,
+    }
+
+    if n_jobs == 1:
+        rows = _sweep_run(ks, options, samples)
+    else:
+        block = shared_memory.SharedMemory(create=True, size=max(samples.nbytes, 1))
+        try:
+            np.ndarray(samples.shape, dtype=samples.dtype, buffer=block.buf)[:] = (
+                samples
+            )
+            threads = max(1, (os.cpu_count() or 1) // n_jobs)
+            with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                initializer=_attach,
+                initargs=(block.name, samples.shape, samples.dtype, threads),
+            ) as pool:
+                runs = pool.map(_sweep_run, _split(ks, n_jobs), [options] * n_jobs)
+                rows = [row for run in runs for row in run]
+        finally:
+            block.close()
+            block.unlink()
+
+    ks, inertias, silhouettes, davies_bouldins = (np.array(col) for col in zip(*rows))
+    return SweepResult(ks, inertias, silhouettes, davies_bouldins)
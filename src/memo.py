@@ -0,0 +1,173 @@
+"""Content-addressed, size-bounded cache for fitted models and results.
+
+script.py refits the same estimators and recomputes the same linkage on every
+run. Memo stores fitted estimators and function results on disk under a key
+built from the input data, the estimator parameters or function arguments,
+and the numpy, scipy and scikit-learn versions. A repeated call with
+unchanged inputs loads the stored result instead of recomputing it. Entries
+are evicted least recently used first once the cache grows past max_bytes.
+"""
+
+import hashlib
+import os
+
+import joblib
+import numpy as np
+import scipy
+import sklearn
+from scipy import sparse
+
+from cache import CACHE_DIR
+
+VERSIONS = "numpy=%s scipy=%s sklearn=%s" % (
+    np.__version__,
+    scipy.__version__,
+    sklearn.__version__,
+)
+
+
+def _update(digest, value):
+    # Hash arrays by content and everything else by its representation
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(("ndarray%s%s" % (value.shape, value.dtype)).encode())
+        digest.update(
+            value.data if value.dtype != object else repr(value.tolist()).encode()
+        )
+    elif sparse.issparse(value):
+        value = value.tocsr()
+        digest.update(("sparse%s" % (value.shape,)).encode())
+        for part in (value.data, value.indices, value.indptr):
+            _update(digest, part)
+    elif hasattr(value, "to_numpy") and hasattr(value, "index"):
+        # pandas objects: values and labels
+        _update(digest, value.to_numpy())
+        _update(digest, np.asarray(value.index, dtype=str))
+        if hasattr(value, "columns"):
+            _update(digest, np.asarray(value.columns, dtype=str))
+    elif isinstance(value, (list, tuple)):
+        digest.update(("%s%d" % (type(value).__name__, len(value))).encode())
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(repr(key).encode())
+            _update(digest, value[key])
+    elif hasattr(value, "get_params"):
+        digest.update(type(value).__name__.encode())
+        _update(digest, value.get_params(deep=False))
+    else:
+        digest.update(repr(value).encode())
+
+
+def digest(*values):
+    """Return the hex digest identifying values and the library versions."""
+    result = hashlib.sha1(VERSIONS.encode())
+    for value in values:
+        _update(result, value)
+    return result.hexdigest()
+
+
+class Memo:
+    """On-disk memoization of estimator fits and function calls."""
+
+    def __init__(self, cache_dir=None, max_bytes=2**30):
+        self.cache_dir = os.path.join(
+            CACHE_DIR if cache_dir is None else cache_dir, "memo"
+        )
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def _get(self, key):
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # A truncated or otherwise unreadable entry counts as a miss and
+            # is dropped, so the result is recomputed and stored again
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return False, None
+        # Refresh the modification time, which orders LRU eviction; a
+        # concurrent evict() may already have removed the file
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return True, value
+
+    def _put(self, key, value):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp = "%s.%d.tmp" % (path, os.getpid())
+        joblib.dump(value, tmp)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def fit(self, estimator, X, y=None, **fit_params):
+        """Fit estimator on X in place, loading a stored fit when one exists.
+
+        On a hit the stored fitted state is copied into estimator, so both
+        estimator.fit(X) style and the returned estimator can be used.
+        """
+        key = digest(
+            "fit",
+            estimator.get_params(deep=True),
+            type(estimator).__name__,
+            X,
+            y,
+            fit_params,
+        )
+        found, fitted = self._get(key)
+        if found:
+            estimator.__dict__.update(fitted.__dict__)
+            return estimator
+        if y is None:
+            estimator.fit(X, **fit_params)
+        else:
+            estimator.fit(X, y, **fit_params)
+        self._put(key, estimator)
+        return estimator
+
+    def call(self, func, *args, **kwargs):
+        """Return func(*args, **kwargs), loading a stored result when one exists."""
+        name = "%s.%s" % (func.__module__, func.__qualname__)
+        key = digest("call", name, args, kwargs)
+        found, result = self._get(key)
+        if found:
+            return result
+        result = func(*args, **kwargs)
+        self._put(key, result)
+        return result
+
+    def clear(self):
+        """Delete every entry of the cache."""
+        if os.path.isdir(self.cache_dir):
+            for entry in os.scandir(self.cache_dir):
+                os.remove(entry.path)
+
+
+memory = Memo()
@@ -0,0 +1,150 @@
+"""Online, mini-batch NMF for corpora that do not fit in memory.
+
+NMF in script.py solves for the whole articles or artists matrix at once.
+OnlineNMF instead streams row blocks: the codes of each block are solved
+against the current components with multiplicative updates, folded into the
+sufficient statistics A = W^T W and B = W^T X, and the components are then
+refreshed from A and B alone. Memory therefore depends on n_components and
+the number of columns, not on the number of rows. New documents or artists
+can be added with partial_fit, and transform solves codes for new rows
+against frozen components without refitting.
+"""
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+
+EPSILON = np.finfo(np.float64).eps
+
+
+def _iter_batches(X, batch_size):
+    for start in range(0, X.shape[0], batch_size):
+        yield X[start : start + batch_size]
+
+
+def reconstruction_error(X, W, H):
+    """Return the Frobenius norm of X - WH without densifying X."""
+    if sparse.issparse(X):
+        norm_x = X.multiply(X).sum()
+        cross = (W * (X @ H.T)).sum()
+    else:
+        norm_x = (X**2).sum()
+        cross = (W * (X @ H.T)).sum()
+    norm_wh = ((W.T @ W) * (H @ H.T)).sum()
+    return np.sqrt(max(norm_x - 2 * cross + norm_wh, 0))
+
+
+class OnlineNMF(BaseEstimator, TransformerMixin):
+    """Non-negative matrix factorization fitted one block of rows at a time.
+
+    Parameters follow sklearn's NMF where they overlap. forget_factor scales
+    down the statistics of earlier blocks each time a new block is seen, so
+    the components track the most recent data more closely as it approaches 0.
+    """
+
+    def __init__(
+        self,
+        n_components=10,
+        batch_size=1024,
+        max_iter=10,
+        code_max_iter=200,
+        forget_factor=0.7,
+        tol=1e-4,
+        random_state=None,
+    ):
+        self.n_components = n_components
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.code_max_iter = code_max_iter
+        self.forget_factor = forget_factor
+        self.tol = tol
+        self.random_state = random_state
+
+    def _check(self, X):
+        if sparse.issparse(X):
+            X = X.tocsr().astype(np.float64)
+            values = X.data
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            values = X
+        if values.size and values.min() < 0:
+            raise ValueError("OnlineNMF needs a non-negative input")
+        return X
+
+    def _solve_codes(self, X, H):
+        # Multiplicative updates for W with the components held fixed
+        scale = np.sqrt(max(X.mean(), EPSILON) / self.n_components)
+        W = np.full((X.shape[0], self.n_components), scale)
+        XHt = np.asarray(X @ H.T)
+        HHt = H @ H.T
+        for _ in range(self.code_max_iter):
+            previous = W.copy()
+            W *= XHt / np.maximum(W @ HHt, EPSILON)
+            change = np.abs(W - previous).sum() / max(np.abs(previous).sum(), EPSILON)
+            if change < self.tol:
+                break
+        return W
+
+    def _initialize(self, X):
+        rng = np.random.RandomState(self.random_state)
+        scale = np.sqrt(max(X.mean(), EPSILON) / self.n_components)
+        self.components_ = scale * np.abs(
+            rng.standard_normal((self.n_components, X.shape[1]))
+        )
+        self._A = np.zeros((self.n_components, self.n_components))
+        self._B = np.zeros((self.n_components, X.shape[1]))
+        self.n_features_in_ = X.shape[1]
+        self.n_batches_ = 0
+
+    def _update(self, X):
+        W = self._solve_codes(X, self.components_)
+        self._A = self.forget_factor * self._A + W.T @ W
+        self._B = self.forget_factor * self._B + np.asarray((X.T @ W).T)
+
+        # Refresh the components from the statistics of every block seen
+        H = self.components_
+        for _ in range(self.max_iter):
+            H *= self._B / np.maximum(self._A @ H, EPSILON)
+        self.n_batches_ += 1
+
+    def partial_fit(self, X, y=None):
+        """Update the components with the rows of X, one batch at a time."""
+        X = self._check(X)
+        if not hasattr(self, "components_"):
+            self._initialize(X)
+        elif X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                "X has %d features, expected %d" % (X.shape[1], self.n_features_in_)
+            )
+        for batch in _iter_batches(X, self.batch_size):
+            self._update(batch)
+        return self
+
+    def fit(self, X, y=None, n_epochs=5):
+        """Fit the components with n_epochs passes over the rows of X."""
+        X = self._check(X)
+        self._initialize(X)
+        for _ in range(n_epochs):
+            self.partial_fit(X)
+        self.n_components_ = self.n_components
+        return self
+
+    def fit_chunks(self, chunks, n_epochs=1):
+        """Fit over the blocks returned by chunks(), which is called once per epoch."""
+        for _ in range(n_epochs):
+            for chunk in chunks():
+                self.partial_fit(chunk)
+        self.n_components_ = self.n_components
+        return self
+
+    def transform(self, X):
+        """Return the codes of the rows of X against the frozen components."""
+        X = self._check(X)
+        codes = [
+            self._solve_codes(batch, self.components_)
+            for batch in _iter_batches(X, self.batch_size)
+        ]
+        return np.vstack(codes)
+
+    def fit_transform(self, X, y=None, n_epochs=5):
+        return self.fit(X, n_epochs=n_epochs).transform(X)
@@ -0,0 +1,142 @@
+"""Headless, parallel rendering of the analysis figures.
+
+Every section of script.py ends in plt.show(), which blocks unattended runs.
+use_headless switches matplotlib to the Agg backend and turns plt.show() into
+"save every open figure to a numbered PNG". render_all renders a batch of
+figure specifications in worker processes. Each output file is named after a
+hash of its plot kind and data, so unchanged figures are not redrawn, and
+scatter plots with more than max_points points are randomly downsampled.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def use_headless(out_dir="figures", dpi=100):
+    """Make plt.show() write the open figures to out_dir instead of a window."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+
+    os.makedirs(out_dir, exist_ok=True)
+    counter = [0]
+
+    def show(*args, **kwargs):
+        for number in plt.get_fignums():
+            counter[0] += 1
+            path = os.path.join(out_dir, "figure-%03d.png" % counter[0])
+            plt.figure(number).savefig(path, dpi=dpi)
+        plt.close("all")
+
+    plt.show = show
+    return show
+
+
+def scatter(
+    ax, xs, ys, c=None, centroids=None, annotations=None, max_points=50000, **kwargs
+):
+    n = len(xs)
+    if n > max_points:
+        # Plot a fixed random subset of the points, with matching colours
+        keep = np.sort(np.random.RandomState(0).choice(n, max_points, replace=False))
+        xs, ys = np.asarray(xs)[keep], np.asarray(ys)[keep]
+        if c is not None and np.ndim(c) == 1 and len(c) == n:
+            c = np.asarray(c)[keep]
+        if annotations is not None:
+            annotations = [annotations[i] for i in keep]
+
+    ax.scatter(xs, ys, c=c, **kwargs)
+    if centroids is not None:
+        centroids = np.asarray(centroids)
+        ax.scatter(centroids[:, 0], centroids[:, 1], marker="D", s=50)
+    if annotations is not None:
+        for x, y, text in zip(xs, ys, annotations):
+            ax.annotate(text, (x, y), fontsize=5, alpha=0.75)
+
+
+def elbow(ax, ks, inertias):
+    ax.plot(ks, inertias, "-o")
+    ax.set_xlabel("number of clusters, k")
+    ax.set_ylabel("inertia")
+    ax.set_xticks(list(ks))
+
+
+def bar(ax, values, xlabel="PCA feature", ylabel="variance"):
+    features = range(len(values))
+    ax.bar(features, values)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_xticks(list(features))
+
+
+def dendrogram(ax, mergings, labels=None):
+    from scipy.cluster.hierarchy import dendrogram
+
+    labels = None if labels is None else list(labels)
+    dendrogram(mergings, labels=labels, leaf_rotation=90, leaf_font_size=6, ax=ax)
+
+
+def bitmap(ax, sample, shape=(13, 8)):
+    image = ax.imshow(np.reshape(sample, shape), cmap="gray", interpolation="nearest")
+    ax.figure.colorbar(image, ax=ax)
+
+
+PLOTS = {
+    "scatter": scatter,
+    "elbow": elbow,
+    "bar": bar,
+    "dendrogram": dendrogram,
+    "bitmap": bitmap,
+}
+
+
+def _render(task):
+    path, kind, kwargs, dpi = task
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+
+    figure, ax = plt.subplots()
+    try:
+        PLOTS[kind](ax, **kwargs)
+        tmp = "%s.%d.tmp.png" % (path, os.getpid())
+        figure.savefig(tmp, dpi=dpi)
+        os.replace(tmp, path)
+    finally:
+        plt.close(figure)
+    return path
+
+
+def render_all(figures, out_dir="figures", n_jobs=None, dpi=100):
+    """Render (name, kind, kwargs) figure specifications to PNG files.
+
+    Returns the output paths in the order of figures. Figures whose file
+    already exists for the same kind and data are not rendered again.
+    """
+    # memo pulls in sklearn and joblib, which the render workers never need
+    from memo import digest
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths, tasks = [], []
+    for name, kind, kwargs in figures:
+        if kind not in PLOTS:
+            raise ValueError(
+                "unknown plot kind %r, expected one of %s" % (kind, sorted(PLOTS))
+            )
+        key = digest(kind, kwargs, dpi)
+        path = os.path.join(out_dir, "%s-%s.png" % (name, key[:12]))
+        paths.append(path)
+        if not os.path.exists(path):
+            tasks.append((path, kind, kwargs, dpi))
+
+    if n_jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            _render(task)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            list(pool.map(_render, tasks))
+    return paths
@@ -0,0 +1,130 @@
+"""Re-cluster the stock movements over a sliding window as new days arrive.
+
+The stock section of script.py fits make_pipeline(Normalizer(), KMeans(10))
+on the full companies x days history. RollingClusters keeps the last window
+days in a ring buffer instead: a new day overwrites the oldest column, and
+the squared row norms, the row-centroid dot products and the squared
+centroid norms are each corrected for the one column that changed. The
+centroid coordinate for the new day is the mean of its normalized values
+within each cluster. A day therefore costs O(n_companies x n_clusters), and
+the companies are reassigned to the nearest adjusted centroid.
+
+Centroids move only in the column of the newest day between refits, so every
+refit_every days the window is renormalized and KMeans is refitted, warm
+started from the current centroids, which also clears accumulated rounding
+error. The buffer is kept in ring order throughout; KMeans does not care
+about the order of the columns.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+Changes = namedtuple("Changes", ["companies", "previous", "current"])
+
+
+class RollingClusters:
+    """Cosine KMeans over a sliding window of daily columns.
+
+    fit(history) clusters the last window columns of a companies x days
+    array. update(days) appends one day, or a companies x days block of them,
+    and returns the Changes of the companies whose cluster changed.
+    """
+
+    def __init__(
+        self,
+        n_clusters=10,
+        window=250,
+        refit_every=20,
+        n_init=10,
+        max_iter=300,
+        companies=None,
+        random_state=None,
+    ):
+        self.n_clusters = n_clusters
+        self.window = window
+        self.refit_every = refit_every
+        self.n_init = n_init
+        self.max_iter = max_iter
+        self.companies = companies
+        self.random_state = random_state
+
+    def _norms(self):
+        return np.sqrt(np.maximum(self._squared_norms, 0))
+
+    def _refit(self, init):
+        self._squared_norms = np.einsum("ij,ij->i", self._buffer, self._buffer)
+        norms = self._norms()
+        normalized = self._buffer / np.where(norms == 0, 1, norms)[:, None]
+        if init is None:
+            model = KMeans(
+                self.n_clusters,
+                n_init=self.n_init,
+                max_iter=self.max_iter,
+                random_state=self.random_state,
+            )
+        else:
+            model = KMeans(self.n_clusters, init=init, n_init=1, max_iter=self.max_iter)
+        self.labels_ = model.fit_predict(normalized).astype(np.intp)
+        self.cluster_centers_ = model.cluster_centers_
+        self._dots = self._buffer @ self.cluster_centers_.T
+        self._center_norms = (self.cluster_centers_**2).sum(axis=1)
+        self._since_refit = 0
+
+    def fit(self, history):
+        history = np.asarray(history, dtype=np.float64)
+        days = min(history.shape[1], self.window)
+        self._buffer = np.zeros((history.shape[0], self.window))
+        self._buffer[:, :days] = history[:, history.shape[1] - days :]
+        self._head = days % self.window
+        self._refit(None)
+        return self
+
+    def _append(self, day):
+        head = self._head
+        old = self._buffer[:, head].copy()
+        self._buffer[:, head] = day
+        self._squared_norms += day**2 - old**2
+        norms = self._norms()
+        inverse = np.where(norms == 0, 0, 1 / np.where(norms == 0, 1, norms))
+
+        # The centroid coordinate for this column becomes the cluster mean
+        # of the new day's normalized values
+        sizes = np.bincount(self.labels_, minlength=self.n_clusters)
+        sums = np.bincount(
+            self.labels_, weights=day * inverse, minlength=self.n_clusters
+        )
+        coordinate = np.where(sizes > 0, sums / np.maximum(sizes, 1), 0)
+        previous = self.cluster_centers_[:, head].copy()
+        self.cluster_centers_[:, head] = coordinate
+        self._center_norms += coordinate**2 - previous**2
+        self._dots += np.outer(day, coordinate) - np.outer(old, previous)
+
+        # Squared distance between a normalized row and each centroid, up to
+        # the constant 1 of the row itself
+        distances = self._center_norms[None, :] - 2 * self._dots * inverse[:, None]
+        self.labels_ = np.argmin(distances, axis=1)
+        self._head = (head + 1) % self.window
+
+        self._since_refit += 1
+        if self._since_refit >= self.refit_every:
+            self._refit(self.cluster_centers_)
+
+    def update(self, days):
+        """Append days, oldest first, and return the Changes they caused."""
+        days = np.asarray(days, dtype=np.float64)
+        if days.ndim == 1:
+            days = days[:, None]
+        if days.shape[0] != self._buffer.shape[0]:
+            raise ValueError(
+                "expected %d companies, got %d" % (self._buffer.shape[0], days.shape[0])
+            )
+        before = self.labels_.copy()
+        for column in days.T:
+            self._append(column)
+        changed = np.flatnonzero(before != self.labels_)
+        companies = (
+            changed if self.companies is None else np.asarray(self.companies)[changed]
+        )
+        return Changes(companies, before[changed], self.labels_[changed])
@@ -0,0 +1,94 @@
+"""Chunked ingestion of listening logs into a sparse artist x user matrix.
+
+script.py reads scrobbler-small-sample.csv whole, sorts it and builds a
+coo_matrix from copies of its columns. Here the log is read in chunks of
+(user_offset, artist_offset, playcount) rows. Each chunk is turned into a
+CSR matrix, which sums duplicate pairs without a global sort. Once the
+pending partial matrices hold more than merge_nnz stored values they are
+folded into a running total, so memory stays close to the size of the final
+CSR matrix, which feeds the MaxAbsScaler -> NMF -> Normalizer pipeline
+unchanged. The matrix is held in memory; out_path only saves the result.
+"""
+
+import os
+import resource
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix, csr_matrix, save_npz
+
+IngestStats = namedtuple("IngestStats", ["rows", "seconds", "rows_per_sec", "peak_rss"])
+
+COLUMNS = ("artist_offset", "user_offset", "playcount")
+
+
+def _resize(matrix, shape):
+    matrix = matrix.tocsr()
+    matrix.resize(shape)
+    return matrix
+
+
+def _sum(matrices):
+    # Sum partial matrices after growing them to a common shape
+    shape = tuple(max(m.shape[axis] for m in matrices) for axis in (0, 1))
+    total = _resize(matrices[0], shape)
+    for matrix in matrices[1:]:
+        total = total + _resize(matrix, shape)
+    return total
+
+
+def peak_rss():
+    """Return the peak resident set size of this process in bytes."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return usage if os.uname().sysname == "Darwin" else usage * 1024
+
+
+def ingest_scrobbles(path, out_path=None, chunksize=1000000, merge_nnz=50000000):
+    """Return (artists, stats) for the listening log at path.
+
+    artists is a CSR matrix with one row per artist_offset and one column per
+    user_offset, holding summed playcounts. When out_path is given the
+    finished matrix is also written there with scipy.sparse.save_npz.
+    """
+    start = time.perf_counter()
+    rows = 0
+    total = None
+    pending, pending_nnz = [], 0
+
+    reader = pd.read_csv(
+        path, usecols=list(COLUMNS), dtype=np.int64, chunksize=chunksize
+    )
+    for chunk in reader:
+        if not len(chunk):
+            continue
+        artist = chunk["artist_offset"].to_numpy()
+        user = chunk["user_offset"].to_numpy()
+        playcount = chunk["playcount"].to_numpy()
+        rows += len(chunk)
+
+        # Converting to CSR sums the duplicate (artist, user) pairs
+        partial = coo_matrix(
+            (playcount, (artist, user)),
+            shape=(artist.max() + 1, user.max() + 1),
+        ).tocsr()
+        pending.append(partial)
+        pending_nnz += partial.nnz
+
+        if pending_nnz >= merge_nnz:
+            total = _sum(pending if total is None else [total] + pending)
+            pending, pending_nnz = [], 0
+
+    if rows == 0:
+        raise ValueError("%s contains no rows" % path)
+    parts = pending if total is None else [total] + pending
+    artists = csr_matrix(_sum(parts))
+
+    if out_path is not None:
+        save_npz(out_path, artists, compressed=False)
+
+    seconds = time.perf_counter() - start
+    stats = IngestStats(rows, seconds, rows / seconds, peak_rss())
+    return artists, stats
@@ -0,0 +1,182 @@
+"""The computations behind the sections of script.py, without any output.
+
+analyses.py prints and plots these results, and dag.py schedules them as
+stages. Parameter names match the names of the values they consume, so a
+dag.Stage can call them directly. Each function imports what it needs when
+it runs and reads its data through the datasets registry, and each is an
+instrument.section, recorded whenever a Recorder is active.
+"""
+
+import os
+
+import numpy as np
+
+import datasets
+from instrument import section
+
+
+def _stratified_subset(samples, classes):
+    # The 42-row stratified split that script.py takes before every linkage
+    from sklearn.model_selection import train_test_split
+
+    samples, _, classes, _ = train_test_split(
+        samples, classes, train_size=42, stratify=classes, random_state=42
+    )
+    return samples, np.asarray(classes)
+
+
+@section
+def normalized_movements():
+    from sklearn.preprocessing import normalize
+
+    return normalize(datasets.load("movements"))
+
+
+@section
+def stock_labels():
+    from sklearn.cluster import KMeans
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import Normalizer
+
+    movements = datasets.load("movements")
+    pipeline = make_pipeline(Normalizer(), KMeans(n_clusters=10))
+    return pipeline.fit(movements).predict(movements)
+
+
+@section
+def stock_mergings(normalized_movements):
+    from hierarchy import linkage
+
+    return linkage(normalized_movements, method="complete")
+
+
+@section
+def stock_tsne(normalized_movements):
+    from sklearn.manifold import TSNE
+
+    return TSNE(learning_rate=50).fit_transform(normalized_movements)
+
+
+@section
+def seeds_subset():
+    """Return the 42 stratified seeds samples and their varieties."""
+    return _stratified_subset(
+        datasets.load("seeds_samples"), datasets.load("seeds_varieties")
+    )
+
+
+@section
+def seeds_mergings(seeds_subset_samples):
+    from hierarchy import linkage
+    from memo import memory
+
+    return memory.call(linkage, seeds_subset_samples, method="complete")
+
+
+@section
+def seeds_cut(seeds_mergings, threshold=6):
+    from hierarchy import cut_sweep
+
+    return cut_sweep(seeds_mergings, thresholds=[threshold]).labels[0]
+
+
+@section
+def seeds_tsne():
+    from sklearn.manifold import TSNE
+
+    return TSNE(learning_rate=200).fit_transform(datasets.load("seeds_samples"))
+
+
+@section
+def eurovision_subset():
+    """Return the 42 stratified Eurovision score rows and their countries."""
+    return _stratified_subset(
+        datasets.load("eurovision_samples"), datasets.load("eurovision_countries")
+    )
+
+
+@section
+def eurovision_mergings(eurovision_subset_samples):
+    from hierarchy import linkage
+
+    return linkage(eurovision_subset_samples, method="single")
+
+
+@section
+def grains_pca():
+    from sklearn.decomposition import PCA
+
+    return PCA().fit(datasets.load("grains"))
+
+
+@section
+def wikipedia():
+    """Return the articles as a sparse matrix and their titles."""
+    from sparse_csv import load_sparse_csv
+
+    path = os.path.join(datasets.DATA_DIR, "wikipedia-vectors.csv")
+    articles, titles, _ = load_sparse_csv(path, transpose=True)
+    return articles, list(titles)
+
+
+@section
+def article_labels(articles):
+    from sklearn.cluster import KMeans
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.pipeline import make_pipeline
+
+    pipeline = make_pipeline(TruncatedSVD(n_components=50), KMeans(n_clusters=6))
+    return pipeline.fit(articles).predict(articles)
+
+
+@section
+def article_nmf(articles):
+    """Return the NMF features and components of the articles."""
+    from sklearn.decomposition import NMF
+
+    model = NMF(n_components=6)
+    return model.fit_transform(articles), model.components_
+
+
+@section
+def article_similarities(nmf_features, titles, title="Cristiano Ronaldo"):
+    from sklearn.preprocessing import normalize
+
+    norm_features = normalize(nmf_features)
+    return norm_features @ norm_features[list(titles).index(title)]
+
+
+@section
+def digit_nmf():
+    """Return the NMF features and components of the LCD digits."""
+    from sklearn.decomposition import NMF
+
+    model = NMF(n_components=7)
+    return model.fit_transform(datasets.load("lcd_digits")), model.components_
+
+
+@section
+def digit_pca_components():
+    from sklearn.decomposition import PCA
+
+    return PCA(n_components=7).fit(datasets.load("lcd_digits")).components_
+
+
+@section
+def artist_features():
+    from sklearn.decomposition import NMF
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import MaxAbsScaler, Normalizer
+
+    from scrobbler import ingest_scrobbles
+
+    path = os.path.join(datasets.DATA_DIR, "scrobbler-small-sample.csv")
+    artists, _ = ingest_scrobbles(path)
+    pipeline = make_pipeline(MaxAbsScaler(), NMF(n_components=20), Normalizer())
+    return pipeline.fit_transform(artists)
+
+
+@section
+def artist_similarities(artist_features, artist="Bruce Springsteen"):
+    names = datasets.load("artist_names").tolist()
+    return artist_features @ artist_features[names.index(artist)]
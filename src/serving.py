@@ -0,0 +1,171 @@
+"""Batch prediction service for fitted cluster pipelines.
+
+script.py calls model.predict(new_points) once, inline. CentroidScorer loads a
+fitted pipeline once (scaler + KMeans, Normalizer + KMeans, TruncatedSVD +
+KMeans, or a bare KMeans), applies its front-end and assigns rows to the
+nearest centroid with blocked distance computations spread over a thread
+pool. BatchingServer puts an asyncio front-end on top: concurrent requests
+are gathered into micro-batches of up to max_batch rows or max_delay
+seconds, scored together, and the latencies of the last max_latencies
+requests kept for stats().
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+
+
+class CentroidScorer:
+    """Nearest-centroid scoring for a fitted pipeline ending in KMeans."""
+
+    def __init__(self, pipeline, block_size=16384, n_threads=None):
+        if isinstance(pipeline, (str, os.PathLike)):
+            pipeline = joblib.load(pipeline)
+        if hasattr(pipeline, "steps"):
+            self.front = pipeline[:-1] if len(pipeline.steps) > 1 else None
+            model = pipeline.steps[-1][1]
+        else:
+            self.front, model = None, pipeline
+        if not hasattr(model, "cluster_centers_"):
+            raise ValueError("the last step must be a fitted KMeans-like model")
+
+        self.centers = np.ascontiguousarray(model.cluster_centers_)
+        # Width of the rows the pipeline (or bare model) was fitted on
+        self.n_features = getattr(pipeline, "n_features_in_", self.centers.shape[1])
+        self.center_norms = (self.centers**2).sum(axis=1)
+        self.block_size = block_size
+        self.pool = ThreadPoolExecutor(max_workers=n_threads or os.cpu_count())
+
+    def _assign(self, block):
+        # argmin of |x|^2 - 2 x.c + |c|^2 only needs the last two terms
+        distances = self.center_norms - 2 * block @ self.centers.T
+        return np.argmin(distances, axis=1)
+
+    def predict(self, X):
+        """Return the index of the nearest centroid for every row of X."""
+        if self.front is not None:
+            X = self.front.transform(X)
+        X = np.asarray(X, dtype=self.centers.dtype)
+        if len(X) <= self.block_size:
+            return self._assign(X)
+        blocks = [X[i : i + self.block_size] for i in range(0, len(X), self.block_size)]
+        return np.concatenate(list(self.pool.map(self._assign, blocks)))
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class BatchingServer:
+    """Micro-batching asyncio front-end for a CentroidScorer."""
+
+    def __init__(self, scorer, max_batch=8192, max_delay=0.002, max_latencies=100000):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.latencies = deque(maxlen=max_latencies)
+        self.requests = 0
+        self.rows = 0
+        self.started = None
+        self._queue = None
+        self._worker = None
+        self._batch = []
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._run())
+        self.started = time.perf_counter()
+
+    async def stop(self):
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        # Fail the batch being gathered and every request still queued, so
+        # that no caller waits forever
+        pending = [future for _, future, _ in self._batch]
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait()[1])
+        for future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("server stopped"))
+        self._batch = []
+
+    async def predict(self, rows):
+        """Return the cluster labels of rows, scored in a shared micro-batch."""
+        rows = np.atleast_2d(rows)
+        if rows.ndim != 2 or rows.shape[1] != self.scorer.n_features:
+            raise ValueError(
+                "expected rows with %d columns, got shape %s"
+                % (self.scorer.n_features, rows.shape)
+            )
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_delay
+
+            # Gather requests until the batch is full or the deadline passes
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            # Nothing may escape: the loop is the only consumer of the queue
+            try:
+                rows = np.concatenate([item[0] for item in batch])
+                labels = await loop.run_in_executor(None, self.scorer.predict, rows)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                for _, future, _ in batch:
+                    # Callers that gave up (cancelled or timed out) are done
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            now = time.perf_counter()
+            start = 0
+            for request, future, received in batch:
+                if not future.done():
+                    future.set_result(labels[start : start + len(request)])
+                    self.latencies.append(now - received)
+                    self.requests += 1
+                start += len(request)
+            self.rows += len(rows)
+            self._batch = []
+
+    def stats(self):
+        """Return latency percentiles in seconds and overall rows per second.
+
+        The percentiles cover the last max_latencies requests; requests counts
+        every request answered since start().
+        """
+        latencies = np.array(self.latencies)
+        p50, p95, p99 = (
+            np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+        )
+        elapsed = time.perf_counter() - self.started
+        return {
+            "requests": self.requests,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "rows_per_sec": self.rows / elapsed,
+        }
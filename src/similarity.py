@@ -0,0 +1,174 @@
+"""Top-k cosine similarity index for item-to-item recommendations.
+
+The recommenders in script.py compute df.dot(article) over the whole frame of
+normalized NMF features and then call nlargest(). SimilarityIndex keeps the
+normalized vectors in one contiguous array and answers batched top-k queries
+with blocked matrix products and argpartition. For very large catalogues the
+optional "lsh" mode narrows each query to the items that share a
+random-projection hash bucket in any of several tables, then reranks those
+candidates exactly.
+"""
+
+import numpy as np
+
+
+def _top_k(scores, k):
+    # Indices of the k largest scores of each row, best first
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1)
+
+
+class SimilarityIndex:
+    """Cosine similarity index over the rows of a feature matrix.
+
+    query takes row vectors and query_labels takes row labels; the two are
+    never guessed from the dtype, so integer-valued vectors such as raw play
+    counts are still vectors. Results are returned as (labels, scores)
+    arrays of shape (n_queries, k); labels default to row positions when no
+    labels were given.
+    """
+
+    def __init__(
+        self,
+        features,
+        labels=None,
+        mode="exact",
+        n_bits=12,
+        n_tables=16,
+        block_size=65536,
+        random_state=None,
+    ):
+        if mode not in ("exact", "lsh"):
+            raise ValueError("mode must be 'exact' or 'lsh', got %r" % mode)
+        vectors = np.asarray(features, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors = np.ascontiguousarray(vectors / np.where(norms == 0, 1, norms))
+        self.labels = np.arange(len(vectors)) if labels is None else np.asarray(labels)
+        if self.labels.dtype == object:
+            # Fixed-width strings, so save() never needs pickled arrays
+            self.labels = self.labels.astype(str)
+        self.positions = {label: i for i, label in enumerate(self.labels.tolist())}
+        self.mode = mode
+        self.block_size = block_size
+        self.planes = None
+        if mode == "lsh":
+            rng = np.random.RandomState(random_state)
+            self.planes = rng.standard_normal(
+                (n_tables, n_bits, vectors.shape[1])
+            ).astype(np.float32)
+            self._build_tables()
+
+    def _hash(self, vectors):
+        # One integer bucket code per table and vector, a block of vectors at
+        # a time so the (tables, vectors, bits) intermediate stays small
+        weights = 1 << np.arange(self.planes.shape[1], dtype=np.int64)
+        codes = np.empty((len(self.planes), len(vectors)), dtype=np.int64)
+        for start in range(0, len(vectors), self.block_size):
+            block = vectors[start : start + self.block_size] - self.center
+            bits = np.einsum("tbd,nd->tnb", self.planes, block) > 0
+            codes[:, start : start + len(block)] = bits.astype(np.int64) @ weights
+        return codes
+
+    def _build_tables(self):
+        # Hash around the mean direction, since non-negative features such as
+        # NMF outputs would otherwise fall into a handful of buckets
+        self.center = self.vectors.mean(axis=0)
+        codes = self._hash(self.vectors)
+        self.order = np.argsort(codes, axis=1, kind="stable")
+        self.sorted_codes = np.take_along_axis(codes, self.order, axis=1)
+
+    def _lookup(self, labels):
+        if isinstance(labels, (str, bytes)) or np.ndim(labels) == 0:
+            labels = [labels]
+        try:
+            return self.vectors[[self.positions[label] for label in labels]]
+        except KeyError as error:
+            raise KeyError("unknown label %r" % error.args[0]) from None
+
+    def _normalize(self, vectors):
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.ndim != 2 or vectors.shape[1] != self.vectors.shape[1]:
+            raise ValueError(
+                "expected vectors with %d columns, got shape %s"
+                % (self.vectors.shape[1], vectors.shape)
+            )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _exact(self, vectors, k):
+        best_rows = best_scores = None
+        for start in range(0, len(self.vectors), self.block_size):
+            block = self.vectors[start : start + self.block_size]
+            scores = vectors @ block.T
+            rows = _top_k(scores, k)
+            scores = np.take_along_axis(scores, rows, axis=1)
+            rows += start
+            if best_rows is not None:
+                # Merge this block's winners with the running top-k
+                rows = np.hstack([best_rows, rows])
+                scores = np.hstack([best_scores, scores])
+                keep = _top_k(scores, k)
+                rows = np.take_along_axis(rows, keep, axis=1)
+                scores = np.take_along_axis(scores, keep, axis=1)
+            best_rows, best_scores = rows, scores
+        return best_rows, best_scores
+
+    def _approximate(self, vectors, k):
+        codes = self._hash(vectors)
+        rows = np.empty((len(vectors), min(k, len(self.vectors))), dtype=np.int64)
+        scores = np.empty(rows.shape, dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            candidates = []
+            for table in range(len(self.planes)):
+                lo, hi = np.searchsorted(
+                    self.sorted_codes[table], [codes[table, i], codes[table, i] + 1]
+                )
+                candidates.append(self.order[table, lo:hi])
+            candidates = np.unique(np.concatenate(candidates))
+            if len(candidates) < rows.shape[1]:
+                # Too few items share a bucket, fall back to a full scan
+                rows[i : i + 1], scores[i : i + 1] = self._exact(vector[None], k)
+                continue
+            candidate_scores = self.vectors[candidates] @ vector
+            top = _top_k(candidate_scores[None], k)[0]
+            rows[i], scores[i] = candidates[top], candidate_scores[top]
+        return rows, scores
+
+    def query(self, vectors, k=5):
+        """Return the labels and cosine similarities of the k nearest items."""
+        vectors = self._normalize(vectors)
+        if self.mode == "lsh":
+            rows, scores = self._approximate(vectors, k)
+        else:
+            rows, scores = self._exact(vectors, k)
+        return self.labels[rows], scores
+
+    def query_labels(self, labels, k=5):
+        """Like query, for the stored items with the given labels."""
+        return self.query(self._lookup(labels), k)
+
+    def save(self, path):
+        """Write the index to an uncompressed .npz file."""
+        arrays = {"vectors": self.vectors, "labels": self.labels}
+        if self.planes is not None:
+            arrays["planes"] = self.planes
+        np.savez(path, block_size=self.block_size, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save without rehashing the vectors."""
+        with np.load(path, allow_pickle=False) as stored:
+            index = cls.__new__(cls)
+            index.vectors = stored["vectors"]
+            index.labels = stored["labels"]
+            index.positions = {
+                label: i for i, label in enumerate(index.labels.tolist())
+            }
+            index.block_size = int(stored["block_size"])
+            index.planes = stored["planes"] if "planes" in stored else None
+        index.mode = "exact" if index.planes is None else "lsh"
+        if index.planes is not None:
+            index._build_tables()
+        return index
@@ -0,0 +1,89 @@
+"""Load mostly-zero CSV files straight into a CSR matrix.
+
+The CSV is parsed in row chunks and only the non-zero entries of each chunk
+are kept, so peak memory scales with the number of stored values rather than
+with rows x columns. The parsed matrix is cached as an uncompressed ``.npz``
+file keyed by the SHA-1 of the CSV, so later loads skip parsing entirely.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from cache import cache_path, file_digest
+
+
+def read_sparse_csv(path, chunksize=1000, index_col=0, dtype=np.float64):
+    """Parse a CSV with a label column into (matrix, index, columns)."""
+    data, indices, indptr = [], [], [np.zeros(1, dtype=np.int64)]
+    index = []
+    columns = None
+    nnz = 0
+
+    for chunk in pd.read_csv(path, index_col=index_col, chunksize=chunksize):
+        if columns is None:
+            columns = np.asarray(chunk.columns, dtype=str)
+
+        # Keep only the non-zero entries of the chunk, in row-major order
+        values = chunk.to_numpy(dtype=dtype)
+        rows, cols = np.nonzero(values)
+        data.append(values[rows, cols])
+        indices.append(cols.astype(np.int32))
+
+        # Row pointers are offset by the entries stored so far
+        counts = np.bincount(rows, minlength=values.shape[0])
+        indptr.append(nnz + np.cumsum(counts))
+        nnz += len(rows)
+        index.append(np.asarray(chunk.index, dtype=str))
+
+    if columns is None:
+        raise ValueError("%s contains no rows" % path)
+
+    index = np.concatenate(index)
+    matrix = csr_matrix(
+        (np.concatenate(data), np.concatenate(indices), np.concatenate(indptr)),
+        shape=(len(index), len(columns)),
+    )
+    return matrix, index, columns
+
+
+def load_sparse_csv(path, transpose=False, chunksize=1000, cache=True, cache_dir=None):
+    """Return (matrix, row_labels, column_labels) for the CSV at path.
+
+    With transpose=True the matrix and labels are swapped, which turns the
+    word x article layout of wikipedia-vectors.csv into article rows.
+    """
+    entry = None
+    if cache:
+        key = file_digest(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        entry = cache_path(name, key, ".npz", cache_dir)
+
+    if entry is not None and os.path.exists(entry):
+        with np.load(entry, allow_pickle=False) as stored:
+            matrix = csr_matrix(
+                (stored["data"], stored["indices"], stored["indptr"]),
+                shape=tuple(stored["shape"]),
+            )
+            index, columns = stored["index"], stored["columns"]
+    else:
+        matrix, index, columns = read_sparse_csv(path, chunksize=chunksize)
+        if entry is not None:
+            # Write to a temporary name first so readers never see partial files
+            tmp = entry + ".tmp.npz"
+            np.savez(
+                tmp,
+                data=matrix.data,
+                indices=matrix.indices,
+                indptr=matrix.indptr,
+                shape=np.array(matrix.shape),
+                index=index,
+                columns=columns,
+            )
+            os.replace(tmp, entry)
+
+    if transpose:
+        return matrix.T.tocsr(), columns, index
+    return matrix, index, columns
@@ -0,0 +1,125 @@
+"""Spherical KMeans directly on sparse, normalized document vectors.
+
+The article clustering in script.py reduces the tf-idf matrix with
+TruncatedSVD before running KMeans. SphericalKMeans clusters the l2-normalized
+CSR matrix itself: centroids are dense unit vectors, similarities are
+sparse x dense products and centroid updates are sparse sums, so the input is
+never densified and memory stays proportional to its non-zeros. It can
+follow Normalizer as a pipeline step.
+"""
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClusterMixin, TransformerMixin
+from sklearn.preprocessing import normalize
+
+
+def _similarities(X, centers):
+    return np.asarray(X @ centers.T)
+
+
+class SphericalKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
+    """KMeans under cosine similarity for sparse or dense rows.
+
+    Rows are l2-normalized before clustering. inertia_ is the sum of
+    1 - cosine similarity to the closest centroid, which is half the squared
+    Euclidean inertia of the normalized rows.
+    """
+
+    def __init__(
+        self, n_clusters=8, n_init=10, max_iter=100, tol=1e-6, random_state=None
+    ):
+        self.n_clusters = n_clusters
+        self.n_init = n_init
+        self.max_iter = max_iter
+        self.tol = tol
+        self.random_state = random_state
+
+    def _init_centers(self, X, rng):
+        # Greedy k-means++ seeding with 1 - cosine as the squared distance:
+        # draw a few weighted candidates and keep the one that lowers the
+        # total distance the most
+        n = X.shape[0]
+        n_trials = 2 + int(np.log(self.n_clusters))
+        rows = [rng.randint(n)]
+        closest = 1 - _similarities(X, self._dense(X[rows[:1]]))[:, 0]
+        for _ in range(1, self.n_clusters):
+            weights = np.maximum(closest, 0)
+            total = weights.sum()
+            if total == 0:
+                candidates = rng.randint(n, size=n_trials)
+            else:
+                candidates = rng.choice(n, size=n_trials, p=weights / total)
+            distances = np.minimum(
+                closest[:, None], 1 - _similarities(X, self._dense(X[candidates]))
+            )
+            best = distances.sum(axis=0).argmin()
+            rows.append(candidates[best])
+            closest = distances[:, best]
+        return self._dense(X[rows])
+
+    @staticmethod
+    def _dense(rows):
+        return (
+            rows.toarray()
+            if sparse.issparse(rows)
+            else np.array(rows, dtype=np.float64)
+        )
+
+    def _single_run(self, X, rng):
+        centers = self._init_centers(X, rng)
+        objective = -np.inf
+        for iteration in range(1, self.max_iter + 1):
+            similarities = _similarities(X, centers)
+            labels = similarities.argmax(axis=1)
+            best = similarities[np.arange(X.shape[0]), labels]
+
+            # Sum the rows of each cluster with one sparse product
+            membership = sparse.csr_matrix(
+                (np.ones(X.shape[0]), (labels, np.arange(X.shape[0]))),
+                shape=(self.n_clusters, X.shape[0]),
+            )
+            sums = self._dense(membership @ X)
+            empty = np.flatnonzero(np.asarray(membership.sum(axis=1)).ravel() == 0)
+            if len(empty):
+                # Re-seed empty clusters with the worst-fitting rows
+                sums[empty] = self._dense(X[np.argsort(best)[: len(empty)]])
+            centers = normalize(sums)
+
+            previous, objective = objective, best.sum()
+            if objective - previous <= self.tol * X.shape[0]:
+                break
+        similarities = _similarities(X, centers)
+        labels = similarities.argmax(axis=1)
+        inertia = (1 - similarities[np.arange(X.shape[0]), labels]).sum()
+        return centers, labels, inertia, iteration
+
+    def fit(self, X, y=None):
+        X = normalize(
+            sparse.csr_matrix(X)
+            if sparse.issparse(X)
+            else np.asarray(X, dtype=np.float64)
+        )
+        rng = np.random.RandomState(self.random_state)
+        best = None
+        for _ in range(self.n_init):
+            run = self._single_run(X, rng)
+            if best is None or run[2] < best[2]:
+                best = run
+        centers, labels, inertia, n_iter = best
+        self.cluster_centers_ = centers
+        self.labels_ = labels
+        self.inertia_ = inertia
+        self.n_iter_ = n_iter
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def predict(self, X):
+        return _similarities(normalize(X), self.cluster_centers_).argmax(axis=1)
+
+    def transform(self, X):
+        """Return the cosine distance of every row to every centroid."""
+        return 1 - _similarities(normalize(X), self.cluster_centers_)
+
+    def score(self, X, y=None):
+        return -self.transform(X).min(axis=1).sum()
@@ -0,0 +1,115 @@
+"""Streaming KMeans for point sets that do not fit in memory.
+
+The clustering pipelines of script.py fit full-batch KMeans on in-memory
+arrays. Here the same scaler/normalizer front-ends are chained with
+MiniBatchKMeans and fitted chunk by chunk with ``partial_fit``, so only one
+chunk of rows is ever resident. Chunk sources are passed as a callable that
+returns a fresh iterator, because stateful front-ends such as StandardScaler
+need one pass over the data before the centroids can be updated.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.pipeline import make_pipeline
+
+
+def iter_csv_chunks(path, chunksize=10000, columns=None, **read_csv_kwargs):
+    """Yield float arrays of at most chunksize rows read from a CSV."""
+    for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs):
+        if columns is not None:
+            chunk = chunk.iloc[:, columns]
+        yield chunk.to_numpy(dtype=np.float64)
+
+
+def iter_array_chunks(array, chunksize=10000):
+    """Yield row slices of an array, e.g. one opened with np.load(mmap_mode="r")."""
+    for start in range(0, array.shape[0], chunksize):
+        # Copy the slice so that only this chunk is paged in at a time
+        yield np.asarray(array[start : start + chunksize])
+
+
+def make_streaming_pipeline(*front, n_clusters=8, batch_size=1024, random_state=None):
+    """Chain the given front-end transformers with a MiniBatchKMeans stage."""
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters, batch_size=batch_size, random_state=random_state
+    )
+    return make_pipeline(*front, kmeans)
+
+
+def _open(chunks):
+    # A callable returns a fresh iterator, so the source can be read again
+    return iter(chunks() if callable(chunks) else chunks)
+
+
+def _transform(steps, chunk):
+    for _, step in steps:
+        chunk = step.transform(chunk)
+    return chunk
+
+
+def reservoir_sample(chunks, size, random_state=None):
+    """Return a uniform sample of at most size rows from an iterable of chunks."""
+    rng = np.random.RandomState(random_state)
+    sample = None
+    seen = 0
+    for chunk in chunks:
+        if sample is None:
+            sample = np.empty((size,) + chunk.shape[1:], dtype=chunk.dtype)
+
+        # Fill the reservoir first, then replace rows with decreasing odds
+        fill = min(size - min(seen, size), len(chunk))
+        sample[seen : seen + fill] = chunk[:fill]
+        positions = rng.randint(0, np.arange(seen + fill, seen + len(chunk)) + 1)
+        keep = positions < size
+        sample[positions[keep]] = chunk[fill:][keep]
+        seen += len(chunk)
+    if sample is None:
+        raise ValueError("chunks produced no rows")
+    return sample[: min(seen, size)]
+
+
+def partial_fit_pipeline(pipeline, chunks, n_epochs=1):
+    """Fit a streaming pipeline over the chunks produced by chunks().
+
+    Each front-end step that supports partial_fit gets one pass over the
+    data; stateless steps such as Normalizer are fitted on the first chunk.
+    The final KMeans step then sees n_epochs passes of transformed chunks.
+    """
+    steps = pipeline.steps
+    for position, (_, step) in enumerate(steps[:-1]):
+        fitted = steps[:position]
+        if hasattr(step, "partial_fit"):
+            for chunk in _open(chunks):
+                step.partial_fit(_transform(fitted, chunk))
+        else:
+            step.fit(_transform(fitted, next(_open(chunks))))
+
+    # Seed the centroids from a uniform sample rather than the first chunk,
+    # which is biased whenever the source is sorted
+    kmeans = steps[-1][1]
+    if not hasattr(kmeans, "cluster_centers_"):
+        size = max(3 * kmeans.batch_size, 3 * kmeans.n_clusters)
+        sample = reservoir_sample(
+            (_transform(steps[:-1], chunk) for chunk in _open(chunks)),
+            size,
+            random_state=kmeans.random_state,
+        )
+        kmeans.partial_fit(sample)
+
+    for _ in range(n_epochs):
+        for chunk in _open(chunks):
+            kmeans.partial_fit(_transform(steps[:-1], chunk))
+    return pipeline
+
+
+def predict_chunks(pipeline, chunks):
+    """Return the cluster labels of every row produced by chunks()."""
+    labels = [pipeline.predict(chunk) for chunk in _open(chunks)]
+    return np.concatenate(labels)
+
+
+def streaming_inertia(pipeline, chunks):
+    """Return the inertia of a fitted pipeline over all chunks."""
+    # Pipeline.score forwards to KMeans.score, which is minus the inertia
+    return -sum(pipeline.score(chunk) for chunk in _open(chunks))
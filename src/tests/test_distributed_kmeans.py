@@ -0,0 +1,17 @@
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+
+from distributed_kmeans import DistributedKMeans
+
+
+def test_matches_single_node_kmeans():
+    samples, _ = make_blobs(n_samples=6000, centers=6, random_state=0)
+    model = DistributedKMeans(n_clusters=6, n_workers=3, random_state=0)
+    model.fit(samples)
+    single = KMeans(n_clusters=6, n_init=10, random_state=0).fit(samples)
+
+    assert adjusted_rand_score(single.labels_, model.labels_) > 0.99
+    np.testing.assert_allclose(model.inertia_, single.inertia_, rtol=1e-3)
+    np.testing.assert_array_equal(model.predict(samples), model.labels_)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from evaluation import contingency, evaluate
+
+
+@pytest.mark.parametrize(
+    "classes",
+    [
+        np.array(["Kama wheat", "Rosa wheat", "Canadian wheat"]),
+        np.array([3, 70000, 12]),
+    ],
+)
+def test_contingency_matches_crosstab(classes):
+    rng = np.random.RandomState(0)
+    true_labels = classes[rng.randint(3, size=500)]
+    predicted = rng.randint(4, size=500)
+    table, rows, columns = contingency(true_labels, predicted)
+    expected = pd.crosstab(true_labels, predicted)
+
+    np.testing.assert_array_equal(
+        table, expected.loc[rows.tolist(), columns.tolist()].to_numpy()
+    )
+    assert sorted(rows.tolist()) == sorted(expected.index.tolist())
+    assert sorted(columns.tolist()) == sorted(expected.columns.tolist())
+
+
+def test_chunked_scores_match():
+    rng = np.random.RandomState(0)
+    true_labels = rng.randint(5, size=1000)
+    predicted = rng.randint(7, size=1000)
+    assert evaluate(true_labels, predicted, chunksize=128) == evaluate(
+        true_labels, predicted
+    )
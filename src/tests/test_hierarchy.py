@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from scipy.cluster import hierarchy as scipy_hierarchy
+from sklearn.metrics import adjusted_rand_score
+
+from hierarchy import METHODS, linkage
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_chain_linkage_matches_scipy(method):
+    samples = np.random.RandomState(0).rand(300, 4)
+    # A limit below the condensed matrix forces the in-house algorithms
+    ours = linkage(samples, method=method, memory_limit=64 * 1024)
+    expected = scipy_hierarchy.linkage(samples, method=method)
+
+    np.testing.assert_allclose(ours[:, 2], expected[:, 2])
+    np.testing.assert_array_equal(ours[:, 3], expected[:, 3])
+    for n_clusters in (2, 5, 20):
+        assert (
+            adjusted_rand_score(
+                scipy_hierarchy.fcluster(ours, n_clusters, criterion="maxclust"),
+                scipy_hierarchy.fcluster(expected, n_clusters, criterion="maxclust"),
+            )
+            == 1.0
+        )
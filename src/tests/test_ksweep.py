@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+
+from ksweep import inertia_sweep
+
+
+@pytest.mark.parametrize("centers, seed", [(4, 2), (5, 1)])
+def test_warm_sweep_matches_cold_fits(centers, seed):
+    samples, _ = make_blobs(
+        n_samples=3000, centers=centers, cluster_std=2.0, random_state=seed
+    )
+    ks = range(1, 9)
+    result = inertia_sweep(samples, ks, n_jobs=1, random_state=0)
+    cold = [
+        KMeans(n_clusters=k, n_init=10, random_state=0).fit(samples).inertia_
+        for k in ks
+    ]
+    np.testing.assert_array_equal(result.ks, list(ks))
+    np.testing.assert_array_less(result.inertias, np.array(cold) * 1.005)
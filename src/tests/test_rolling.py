@@ -0,0 +1,26 @@
+import numpy as np
+
+from rolling import RollingClusters
+
+
+def test_incremental_assignment_matches_brute_force():
+    rng = np.random.RandomState(0)
+    history = rng.standard_normal((60, 80))
+    days = rng.standard_normal((60, 15))
+    # No refit, so every label comes from the incremental update
+    model = RollingClusters(
+        n_clusters=5, window=50, refit_every=100, n_init=1, random_state=0
+    )
+    model.fit(history)
+
+    window = history[:, -50:].copy()
+    for day in range(days.shape[1]):
+        changes = model.update(days[:, day])
+        # The new day overwrites the oldest column of the ring buffer
+        window[:, day] = days[:, day]
+        normalized = window / np.linalg.norm(window, axis=1, keepdims=True)
+        distances = (
+            (normalized[:, None, :] - model.cluster_centers_[None, :, :]) ** 2
+        ).sum(axis=2)
+        np.testing.assert_array_equal(model.labels_, np.argmin(distances, axis=1))
+        np.testing.assert_array_equal(changes.current, model.labels_[changes.companies])
@@ -0,0 +1,33 @@
+import numpy as np
+
+from similarity import SimilarityIndex
+
+
+def test_exact_query_matches_full_scan():
+    rng = np.random.RandomState(0)
+    features = rng.rand(500, 8)
+    index = SimilarityIndex(features, block_size=64)
+    normalized = features / np.linalg.norm(features, axis=1, keepdims=True)
+    rows, scores = index.query(features[:20], k=5)
+    expected = np.argsort(-(normalized[:20] @ normalized.T), axis=1)[:, :5]
+    np.testing.assert_array_equal(rows, expected)
+
+
+def test_integer_vectors_are_not_labels():
+    counts = np.random.RandomState(0).randint(0, 5, size=(50, 4))
+    index = SimilarityIndex(counts)
+    rows, _ = index.query(counts[3], k=1)
+    assert rows[0, 0] == 3
+    np.testing.assert_array_equal(index.query_labels([3], k=1)[0], rows)
+
+
+def test_save_load_with_object_labels(tmp_path):
+    features = np.random.RandomState(0).rand(100, 6)
+    labels = np.array(["item %d" % i for i in range(100)], dtype=object)
+    index = SimilarityIndex(features, labels=labels, mode="lsh", random_state=0)
+    index.save(tmp_path / "index.npz")
+    loaded = SimilarityIndex.load(tmp_path / "index.npz")
+    for expected, actual in zip(
+        index.query_labels("item 7"), loaded.query_labels("item 7")
+    ):
+        np.testing.assert_array_equal(expected, actual)
@@ -0,0 +1,33 @@
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from streaming import (
+    iter_array_chunks,
+    make_streaming_pipeline,
+    partial_fit_pipeline,
+    predict_chunks,
+    streaming_inertia,
+)
+
+
+def test_streaming_labels_match_batch():
+    samples, _ = make_blobs(n_samples=20000, centers=5, random_state=0)
+    # Sorted rows, so no single chunk is representative
+    samples = samples[np.argsort(samples[:, 0])]
+
+    def chunks():
+        return iter_array_chunks(samples, chunksize=2000)
+
+    stream = make_streaming_pipeline(StandardScaler(), n_clusters=5, random_state=0)
+    partial_fit_pipeline(stream, chunks, n_epochs=3)
+    batch = make_pipeline(StandardScaler(), KMeans(n_clusters=5, random_state=0))
+    batch.fit(samples)
+
+    labels = predict_chunks(stream, chunks)
+    assert adjusted_rand_score(batch.predict(samples), labels) > 0.99
+    batch_inertia = -batch.score(samples)
+    assert streaming_inertia(stream, chunks) <= 1.02 * batch_inertia
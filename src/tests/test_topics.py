@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from topics import top_terms
+
+
+@pytest.mark.parametrize("sample_size", [65536, 16])
+def test_top_terms_match_full_sort(sample_size):
+    components = np.random.RandomState(0).rand(7, 1000)
+    result = top_terms(components, n=5, block_size=3000, sample_size=sample_size)
+    expected = np.argsort(-components, axis=1)[:, :5]
+    np.testing.assert_array_equal(result.indices, expected)
+    np.testing.assert_array_equal(
+        result.weights, np.take_along_axis(components, expected, axis=1)
+    )
+
+
+def test_top_terms_words():
+    vocabulary = ["w%d" % i for i in range(10)]
+    components = np.arange(20.0).reshape(2, 10)
+    assert top_terms(components, n=2, vocabulary=vocabulary).words.tolist() == [
+        ["w9", "w8"],
+        ["w9", "w8"],
+    ]
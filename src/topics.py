@@ -0,0 +1,112 @@
+"""Top terms of NMF components over a memory-mapped vocabulary.
+
+script.py reads wikipedia-vocabulary-utf8.txt into a list of Python strings
+and wraps model.components_ in a DataFrame with one column per word, just to
+call nlargest() on one row. top_terms() instead ranks every component at
+once with argpartition on the components matrix. Vocabulary maps the
+selected indices back to words through an array of line offsets into the
+memory-mapped vocabulary file. The offsets are built once and cached as
+.npy, keyed by the file's path, size and modification time, so a lookup
+decodes only the words it returns.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from cache import cache_path, stat_digest
+
+TopTerms = namedtuple("TopTerms", ["indices", "weights", "words"])
+
+
+class Vocabulary:
+    """One word per line of a UTF-8 text file, indexed by line number."""
+
+    def __init__(self, path, cache_dir=None):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        entry = cache_path("vocabulary", stat_digest(path), ".npy", cache_dir)
+        if not os.path.exists(entry):
+            tmp = entry + ".tmp.npy"
+            np.save(tmp, self._line_starts())
+            os.replace(tmp, entry)
+        self.starts = np.load(entry, mmap_mode="r")
+
+    def _line_starts(self):
+        # Start of every line, plus one past the end of a final line that
+        # has no trailing newline, so line i ends at starts[i + 1] - 1
+        size = len(self.data)
+        ends = np.flatnonzero(self.data == ord("\n"))
+        if not size or self.data[-1] != ord("\n"):
+            ends = np.append(ends, size)
+        dtype = np.uint32 if size + 1 < 2**32 else np.uint64
+        return np.concatenate([[0], ends + 1]).astype(dtype)
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("word %d out of range for %d words" % (index, len(self)))
+        index %= len(self)
+        line = self.data[int(self.starts[index]) : int(self.starts[index + 1]) - 1]
+        return line.tobytes().decode("utf-8").rstrip("\r")
+
+    def words(self, indices):
+        """Return the words at an array of indices, in an array of the same shape."""
+        indices = np.asarray(indices)
+        return np.array([self[int(i)] for i in indices.ravel()], dtype=object).reshape(
+            indices.shape
+        )
+
+
+def _top_block(block, n, sample_size):
+    # Indices of the n largest entries of each row, heaviest first
+    n_rows, n_columns = block.shape
+    if n_columns <= 4 * sample_size:
+        top = np.argpartition(-block, n - 1, axis=1)[:, :n]
+    else:
+        # The n-th largest of a strided subset of a row is a lower bound for
+        # the n-th largest of the whole row, so every top entry clears it
+        subset = block[:, :: n_columns // sample_size]
+        bound = np.partition(subset, subset.shape[1] - n, axis=1)[:, -n]
+        rows, columns = np.divmod(np.flatnonzero(block >= bound[:, None]), n_columns)
+        order = np.lexsort((-block[rows, columns], rows))
+        rows, columns = rows[order], columns[order]
+        # Candidates are grouped by row, heaviest first; keep the first n
+        first = np.searchsorted(rows, np.arange(n_rows))
+        rank = np.arange(len(rows)) - first[rows]
+        top = np.empty((n_rows, n), dtype=np.intp)
+        top[rows[rank < n], rank[rank < n]] = columns[rank < n]
+    weights = np.take_along_axis(block, top, axis=1)
+    order = np.argsort(-weights, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1)
+
+
+def top_terms(components, n=5, vocabulary=None, block_size=2**24, sample_size=65536):
+    """Return the n heaviest terms of every row of components, heaviest first.
+
+    The result is a TopTerms tuple of (n_components, n) arrays; words is
+    None unless a Vocabulary (or any sequence of words) is given. Rows are
+    ranked in blocks of about block_size entries. With more than four times
+    sample_size terms, a strided sample of each row first bounds its n-th
+    largest weight, and only the entries above that bound are sorted.
+    """
+    components = np.asarray(components)
+    n = min(n, components.shape[1])
+    rows_per_block = max(1, block_size // max(components.shape[1], 1))
+    indices = np.concatenate(
+        [
+            _top_block(components[start : start + rows_per_block], n, sample_size)
+            for start in range(0, len(components), rows_per_block)
+        ]
+    )
+    weights = np.take_along_axis(components, indices, axis=1)
+
+    words = None
+    if isinstance(vocabulary, Vocabulary):
+        words = vocabulary.words(indices)
+    elif vocabulary is not None:
+        words = np.asarray(vocabulary, dtype=object)[indices]
+    return TopTerms(indices, weights, words)